@@ -6,13 +6,21 @@ risk assessment that feeds into the hybrid routing decision. High-risk
 prompts are recommended for local (on-device) processing to keep
 sensitive data off the wire.
 
-Zero external dependencies — pure stdlib regex patterns.
+Zero external dependencies — pure stdlib regex patterns. If google-re2 is
+installed, patterns it can express are compiled with RE2 instead for
+guaranteed linear-time matching.
 """
 
 import re
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import List, Tuple
+from functools import lru_cache
+from typing import Dict, List, Tuple, Union
+
+try:
+    import re2 as _re2  # optional: pip install google-re2
+except ImportError:
+    _re2 = None
 
 
 class RiskLevel(str, Enum):
@@ -36,7 +44,7 @@ class PIIType(str, Enum):
     NAME_CONTEXT = "name_context"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PIIMatch:
     pii_type: PIIType
     matched_text: str
@@ -45,7 +53,7 @@ class PIIMatch:
     end: int
 
 
-@dataclass
+@dataclass(slots=True)
 class PrivacyResult:
     risk_level: RiskLevel
     pii_found: List[PIIMatch] = field(default_factory=list)
@@ -61,46 +69,67 @@ class PrivacyResult:
 # Compiled regex patterns
 # ---------------------------------------------------------------------------
 
-_PATTERNS: List[Tuple[PIIType, re.Pattern, float]] = [
+_LOOKAROUND = re.compile(r"\(\?<?[=!]")
+
+
+def _compile(pattern: str, flags: int = 0):
+    """Compile with RE2 when available, else (or if RE2 rejects it) with re.
+
+    RE2's \b, \w and \d are ASCII-only, so only patterns that already ask
+    for re.A are handed to it.
+    """
+    if _re2 is not None and flags & re.A and not _LOOKAROUND.search(pattern):
+        try:
+            return _re2.compile(("(?i)" if flags & re.I else "") + pattern)
+        except _re2.error:
+            pass
+    return re.compile(pattern, flags)
+
+
+# Confidence is a float, or a dict keyed by named group for fused patterns.
+_PATTERNS: List[Tuple[PIIType, re.Pattern, Union[float, Dict[str, float]]]] = [
     # Email
     (PIIType.EMAIL,
-     re.compile(r"\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b"),
+     _compile(r"\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,}\b", re.A),
      0.95),
 
     # Phone numbers (international & US formats)
     (PIIType.PHONE,
-     re.compile(
+     _compile(
          r"(?<!\d)"
          r"(?:\+?\d{1,3}[\s\-.]?)?"
          r"(?:\(?\d{2,4}\)?[\s\-.]?)"
          r"\d{3,4}[\s\-.]?\d{3,4}"
-         r"(?!\d)"
+         r"(?!\d)",
+         re.A
      ),
      0.85),
 
     # SSN (US)
     (PIIType.SSN,
-     re.compile(r"\b\d{3}[\s\-]?\d{2}[\s\-]?\d{4}\b"),
+     _compile(r"\b\d{3}[\s\-]?\d{2}[\s\-]?\d{4}\b", re.A),
      0.90),
 
     # Credit card numbers (13-19 digits, optional separators)
     (PIIType.CREDIT_CARD,
-     re.compile(
-         r"\b(?:\d[\s\-]?){12,18}\d\b"
+     _compile(
+         r"\b(?:\d[\s\-]?){12,18}\d\b",
+         re.A
      ),
      0.90),
 
     # IP addresses (IPv4)
     (PIIType.IP_ADDRESS,
-     re.compile(
+     _compile(
          r"\b(?:(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\.){3}"
-         r"(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\b"
+         r"(?:25[0-5]|2[0-4]\d|[01]?\d\d?)\b",
+         re.A
      ),
      0.80),
 
     # Date of birth patterns
     (PIIType.DATE_OF_BIRTH,
-     re.compile(
+     _compile(
          r"\b(?:born\s+(?:on\s+)?|dob[\s:]+|date\s+of\s+birth[\s:]+|birthday[\s:]+)"
          r"(?:\d{1,2}[\s/\-\.]\d{1,2}[\s/\-\.]\d{2,4}|\w+\s+\d{1,2},?\s+\d{4})",
          re.I
@@ -109,35 +138,33 @@ _PATTERNS: List[Tuple[PIIType, re.Pattern, float]] = [
 
     # Passport number patterns
     (PIIType.PASSPORT,
-     re.compile(
+     _compile(
          r"\b(?:passport[\s#:]+)([A-Z]{1,2}\d{6,9})\b",
-         re.I
+         re.I | re.A
      ),
      0.85),
 
-    # Street address (number + street name + type)
+    # Street address (number + street name + type) or postal / ZIP code
+    # (US, UK, Singapore, Australia, Canada, EU), fused into one pass. Only
+    # the street branch is case-insensitive; the matching group sets the
+    # confidence.
     (PIIType.STREET_ADDRESS,
-     re.compile(
+     _compile(
+         r"(?P<street>(?i:"
          r"\b\d{1,6}[A-Za-z]?\s+(?:[A-Z][a-z]+\s+){1,4}"
          r"(?:St(?:reet)?|Ave(?:nue)?|Blvd|Boulevard|Dr(?:ive)?|"
          r"Ln|Lane|Rd|Road|Way|Ct|Court|Pl(?:ace)?|Cir(?:cle)?|"
          r"Pkwy|Parkway|Terr(?:ace)?|Hwy|Highway|Close|Crescent|Walk)"
-         r"\.?\b",
-         re.I
-     ),
-     0.85),
-
-    # Postal / ZIP codes (US, UK, Singapore, Australia, Canada, EU)
-    (PIIType.STREET_ADDRESS,
-     re.compile(
-         r"\b(?:"
+         r"\.?\b"
+         r"))|(?P<postal>\b(?:"
          r"\d{5}(?:-\d{4})?|"                  # US ZIP: 12345 or 12345-6789
          r"\d{6}|"                              # SG/IN postal: 085201
          r"[A-Z]{1,2}\d[A-Z\d]?\s*\d[A-Z]{2}|" # UK: SW1A 1AA
          r"[A-Z]\d[A-Z]\s*\d[A-Z]\d"            # CA: K1A 0B1
-         r")\b"
+         r")\b)",
+         re.A
      ),
-     0.70),
+     {"street": 0.85, "postal": 0.70}),
 ]
 
 # Keyword-based patterns (lower confidence, context-dependent)
@@ -182,24 +209,82 @@ _KEYWORD_PATTERNS: List[Tuple[PIIType, re.Pattern, float]] = [
     (PIIType.NAME_CONTEXT, _NAME_CONTEXT_KEYWORDS, 0.65),
 ]
 
+# The keyword vocabularies are disjoint, so they can share one alternation
+# and a single pass over the text; the named group that matched identifies
+# the PII type. The structural patterns above stay separate because their
+# spans legitimately overlap (phone vs SSN vs card) and risk scoring counts
+# every hit.
+# No re.A here: the keywords end in \b right before the value, and an
+# ASCII-only \b finds no boundary between "api_key: " and "Élan".
+_KEYWORD_GROUPS: Dict[str, Tuple[PIIType, float]] = {
+    pii_type.value: (pii_type, confidence)
+    for pii_type, _, confidence in _KEYWORD_PATTERNS
+}
+_FUSED_KEYWORDS = _compile(
+    "|".join(
+        f"(?P<{pii_type.value}>{pattern.pattern})"
+        for pii_type, pattern, _ in _KEYWORD_PATTERNS
+    ),
+    re.I,
+)
+
+# Cheap literal prefilter: every structural pattern except email needs a
+# digit, and some also need one of a few literal substrings. A pattern is
+# only run when its requirements are present in the text. The digit test is
+# Unicode because DOB also matches non-ASCII digits ("born on ١٢/١٢/١٩٩٠").
+_DIGIT = re.compile(r"\d")
+
+# The structural patterns are ASCII-only (re.A, or RE2), so their \s is just
+# [ \t\n\r\f\v]. Any other whitespace (NBSP, thin space, ...) is folded to a
+# plain space before they run; the substitution is one char for one, so match
+# spans still index the original text.
+_UNICODE_SPACE = re.compile(r"[^\S \t\n\r\f\v]")
+
+_PREFILTER: Dict[PIIType, Tuple[bool, Tuple[str, ...]]] = {
+    # pii_type: (needs_digit, any-of lower-cased literals)
+    PIIType.EMAIL: (False, ("@",)),
+    PIIType.PHONE: (True, ()),
+    PIIType.SSN: (True, ()),
+    PIIType.CREDIT_CARD: (True, ()),
+    PIIType.IP_ADDRESS: (True, (".",)),
+    PIIType.DATE_OF_BIRTH: (True, ("born", "dob", "birth")),
+    PIIType.PASSPORT: (True, ("passport",)),
+    PIIType.STREET_ADDRESS: (True, ()),
+}
+
+
+def _candidate_types(text: str, has_digit: bool) -> set:
+    """Return the structural PII types whose patterns could match text."""
+    lowered = text.lower()
+    candidates = set()
+    for pii_type, (needs_digit, literals) in _PREFILTER.items():
+        if needs_digit and not has_digit:
+            continue
+        if literals and not any(lit in lowered for lit in literals):
+            continue
+        candidates.add(pii_type)
+    return candidates
+
 
 # ---------------------------------------------------------------------------
 # Luhn check for credit card validation
 # ---------------------------------------------------------------------------
 
+# Per-digit Luhn values, applied with bytes.translate so the whole checksum
+# is computed in C: digits at even positions (from the right) count as-is,
+# odd positions are doubled with 9 subtracted when the result exceeds 9.
+_LUHN_EVEN = bytes.maketrans(b"0123456789", bytes((0, 1, 2, 3, 4, 5, 6, 7, 8, 9)))
+_LUHN_ODD = bytes.maketrans(b"0123456789", bytes((0, 2, 4, 6, 8, 1, 3, 5, 7, 9)))
+_NON_DIGIT_BYTES = bytes(b for b in range(256) if not 48 <= b <= 57)
+
+
 def _luhn_check(number_str: str) -> bool:
     """Validate a number string with the Luhn algorithm."""
-    digits = [int(d) for d in number_str if d.isdigit()]
+    digits = number_str.encode("ascii", "ignore").translate(None, _NON_DIGIT_BYTES)
     if len(digits) < 13 or len(digits) > 19:
         return False
-    checksum = 0
     reverse = digits[::-1]
-    for i, d in enumerate(reverse):
-        if i % 2 == 1:
-            d *= 2
-            if d > 9:
-                d -= 9
-        checksum += d
+    checksum = sum(reverse[0::2].translate(_LUHN_EVEN)) + sum(reverse[1::2].translate(_LUHN_ODD))
     return checksum % 10 == 0
 
 
@@ -207,80 +292,99 @@ def _luhn_check(number_str: str) -> bool:
 # Main API
 # ---------------------------------------------------------------------------
 
-def scan_privacy(text: str) -> PrivacyResult:
-    """
-    Scan text for PII and return a privacy risk assessment.
+_HIGH_RISK_TYPES = frozenset({
+    PIIType.SSN, PIIType.CREDIT_CARD, PIIType.PASSWORD,
+    PIIType.PASSPORT, PIIType.HEALTH, PIIType.FINANCIAL,
+})
+_MEDIUM_RISK_TYPES = frozenset({
+    PIIType.EMAIL, PIIType.PHONE, PIIType.DATE_OF_BIRTH,
+    PIIType.STREET_ADDRESS, PIIType.NAME_CONTEXT,
+})
+
+
+def _dedupe_overlaps(matches: List[PIIMatch]) -> List[PIIMatch]:
+    """Drop matches contained in an earlier kept match of equal or higher confidence."""
+    kept: List[PIIMatch] = []
+    for m in sorted(matches, key=lambda m: (m.start, -m.confidence, -m.end)):
+        if any(k.end >= m.end and k.confidence >= m.confidence for k in kept):
+            continue
+        kept.append(m)
+    return kept
+
+
+# Scans are memoized on the exact text; retries and repeated prompts skip
+# all regex work. Very long inputs bypass the cache to bound its memory.
+_SCAN_CACHE_SIZE = 1024
+_SCAN_CACHE_MAX_CHARS = 8192
+
+_ScanTuple = Tuple[RiskLevel, Tuple[PIIMatch, ...], str, str]
+
+_NO_PII: _ScanTuple = (RiskLevel.LOW, (), "auto", "No PII detected.")
+
+
+def _scan(text: str) -> _ScanTuple:
+    """Run the detectors and return (risk_level, matches, recommendation, summary)."""
+    # Fast path: casual chat has no digits, no "@" and no keyword hits, in
+    # which case nothing below can match.
+    has_digit = _DIGIT.search(text) is not None
+    if not has_digit and "@" not in text and _FUSED_KEYWORDS.search(text) is None:
+        return _NO_PII
 
-    Returns:
-        PrivacyResult with risk_level, pii_found list, and routing recommendation.
-    """
     matches: List[PIIMatch] = []
+    append = matches.append
 
-    # Run regex patterns
+    # Run regex patterns (only those the literal prefilter allows)
+    candidates = _candidate_types(text, has_digit)
+    folded = _UNICODE_SPACE.sub(" ", text)
     for pii_type, pattern, confidence in _PATTERNS:
-        for m in pattern.finditer(text):
-            matched = m.group()
-
-            # Extra validation for credit cards (Luhn check)
-            if pii_type == PIIType.CREDIT_CARD:
-                digits_only = re.sub(r"\D", "", matched)
-                if not _luhn_check(digits_only):
-                    continue
-
-            # Reduce SSN confidence if it could be a phone number
-            adj_confidence = confidence
-            if pii_type == PIIType.SSN:
-                digits_only = re.sub(r"\D", "", matched)
-                if len(digits_only) != 9:
-                    continue
-
-            matches.append(PIIMatch(
-                pii_type=pii_type,
-                matched_text=matched,
-                confidence=adj_confidence,
-                start=m.start(),
-                end=m.end(),
+        if pii_type not in candidates:
+            continue
+        # Extra validation for credit cards (Luhn check). _luhn_check strips
+        # separators itself; the SSN pattern always spans exactly nine
+        # digits, so it needs no re-count.
+        is_card = pii_type is PIIType.CREDIT_CARD
+        by_group = confidence if isinstance(confidence, dict) else None
+        for m in pattern.finditer(folded):
+            if is_card and not _luhn_check(m.group()):
+                continue
+            start, end = m.span()
+            append(PIIMatch(
+                pii_type, text[start:end], by_group[m.lastgroup] if by_group else confidence, start, end,
             ))
 
-    # Run keyword patterns
-    for pii_type, pattern, confidence in _KEYWORD_PATTERNS:
-        for m in pattern.finditer(text):
-            matches.append(PIIMatch(
-                pii_type=pii_type,
-                matched_text=m.group(),
-                confidence=confidence,
-                start=m.start(),
-                end=m.end(),
-            ))
+    # Run keyword patterns (single fused pass)
+    for m in _FUSED_KEYWORDS.finditer(text):
+        pii_type, confidence = _KEYWORD_GROUPS[m.lastgroup]
+        start, end = m.span()
+        append(PIIMatch(pii_type, m.group(), confidence, start, end))
 
     # Determine risk level
     if not matches:
-        return PrivacyResult(
-            risk_level=RiskLevel.LOW,
-            pii_found=[],
-            recommendation="auto",
-            summary="No PII detected.",
-        )
-
-    # Score based on severity
-    high_risk_types = {
-        PIIType.SSN, PIIType.CREDIT_CARD, PIIType.PASSWORD,
-        PIIType.PASSPORT, PIIType.HEALTH, PIIType.FINANCIAL,
-    }
-    medium_risk_types = {
-        PIIType.EMAIL, PIIType.PHONE, PIIType.DATE_OF_BIRTH,
-        PIIType.STREET_ADDRESS, PIIType.NAME_CONTEXT,
-    }
-
-    has_high = any(m.pii_type in high_risk_types for m in matches)
-    has_medium = any(m.pii_type in medium_risk_types for m in matches)
+        return _NO_PII
+    matches = _dedupe_overlaps(matches)
+
+    # Score based on severity (single pass over the matches)
+    high_risk, medium_risk = _HIGH_RISK_TYPES, _MEDIUM_RISK_TYPES
+    has_high = has_medium = False
+    address_count = name_ctx_count = high_confidence_count = 0
+    pii_type_values = set()
+    for m in matches:
+        pii_type = m.pii_type
+        pii_type_values.add(pii_type.value)
+        if pii_type in high_risk:
+            has_high = True
+        elif pii_type in medium_risk:
+            has_medium = True
+            if pii_type is PIIType.STREET_ADDRESS:
+                address_count += 1
+            elif pii_type is PIIType.NAME_CONTEXT:
+                name_ctx_count += 1
+        if m.confidence >= 0.85:
+            high_confidence_count += 1
 
     # Upgrade to HIGH if address + context ("I live at") or address + postal code
-    address_matches = [m for m in matches if m.pii_type == PIIType.STREET_ADDRESS]
-    name_ctx_matches = [m for m in matches if m.pii_type == PIIType.NAME_CONTEXT]
-    if len(address_matches) >= 2 or (address_matches and name_ctx_matches):
+    if address_count >= 2 or (address_count and name_ctx_count):
         has_high = True
-    high_confidence_count = sum(1 for m in matches if m.confidence >= 0.85)
 
     if has_high or high_confidence_count >= 3:
         risk_level = RiskLevel.HIGH
@@ -292,12 +396,28 @@ def scan_privacy(text: str) -> PrivacyResult:
         risk_level = RiskLevel.LOW
         recommendation = "auto"
 
-    pii_type_names = list({m.pii_type.value for m in matches})
-    summary = f"Detected {len(matches)} PII instance(s): {', '.join(pii_type_names)}."
+    summary = f"Detected {len(matches)} PII instance(s): {', '.join(pii_type_values)}."
+
+    return risk_level, tuple(matches), recommendation, summary
 
+
+_scan_cached = lru_cache(maxsize=_SCAN_CACHE_SIZE)(_scan)
+
+
+def scan_privacy(text: str) -> PrivacyResult:
+    """
+    Scan text for PII and return a privacy risk assessment.
+
+    Returns:
+        PrivacyResult with risk_level, pii_found list, and routing recommendation.
+    """
+    if len(text) <= _SCAN_CACHE_MAX_CHARS:
+        risk_level, matches, recommendation, summary = _scan_cached(text)
+    else:
+        risk_level, matches, recommendation, summary = _scan(text)
     return PrivacyResult(
         risk_level=risk_level,
-        pii_found=matches,
+        pii_found=list(matches),
         recommendation=recommendation,
         summary=summary,
     )
@@ -310,10 +430,17 @@ def redact_pii(text: str, result: PrivacyResult | None = None) -> str:
     if not result.pii_found:
         return text
 
-    # Sort matches by position (reverse) to replace from end to start
-    sorted_matches = sorted(result.pii_found, key=lambda m: m.start, reverse=True)
-    redacted = text
-    for m in sorted_matches:
-        placeholder = f"[REDACTED:{m.pii_type.value}]"
-        redacted = redacted[:m.start] + placeholder + redacted[m.end:]
-    return redacted
+    # Single forward pass: copy the text between matches and emit one
+    # placeholder per match. A match that overlaps the previous one is
+    # folded into it rather than re-splicing already redacted text.
+    parts: List[str] = []
+    cursor = 0
+    for m in sorted(result.pii_found, key=lambda m: (m.start, -m.end)):
+        if m.start < cursor:
+            cursor = max(cursor, m.end)
+            continue
+        parts.append(text[cursor:m.start])
+        parts.append(f"[REDACTED:{m.pii_type.value}]")
+        cursor = m.end
+    parts.append(text[cursor:])
+    return "".join(parts)
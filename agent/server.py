@@ -14,22 +14,26 @@ import json
 import os
 import re
 import sys
-import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 from dataclasses import asdict
 from enum import Enum
 from pathlib import Path
 from typing import List, Optional
 
+import orjson
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
 
-# Ensure cactus is importable
-sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "cactus" / "python" / "src"))
+# Ensure cactus and the project root (main.py) are importable
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_PROJECT_ROOT / "cactus" / "python" / "src"))
+sys.path.insert(0, str(_PROJECT_ROOT))
 os.environ.setdefault("CACTUS_NO_CLOUD_TELE", "1")
 
 from agent.privacy import PrivacyResult, RiskLevel, scan_privacy, redact_pii
@@ -47,33 +51,31 @@ from agent.skills.reminders import CreateReminderSkill, PlayMusicSkill
 
 
 def _register_all_skills():
-    reg = get_registry()
-    for skill_cls in [
+    get_registry().register_all(skill_cls() for skill_cls in (
         BrowseSkill, FileReadSkill, FileWriteSkill, FileListSkill,
         CalendarAddSkill, CalendarListSkill, CalendarDeleteSkill,
         WeatherSkill, SendMessageSkill, SetAlarmSkill, SetTimerSkill,
         SearchContactsSkill, CreateReminderSkill, PlayMusicSkill,
-    ]:
-        reg.register(skill_cls())
+    ))
 
 
 # ---------------------------------------------------------------------------
 # Lazy-load the hybrid router (heavy — loads FunctionGemma model)
-# The Cactus C library is NOT thread-safe. We must serialize all inference
-# calls with a lock to prevent concurrent cactus_reset / cactus_complete.
+# The Cactus C library is NOT thread-safe. All inference runs on a single
+# dedicated worker thread, which serializes cactus_reset / cactus_complete
+# without parking pool threads on a lock.
 # ---------------------------------------------------------------------------
-_hybrid_router = None
-_model_lock = threading.Lock()
+_generators = None
+_inference_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
 
 
-def _get_hybrid_router():
-    global _hybrid_router
-    if _hybrid_router is None:
-        # Import from project root main.py
-        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-        from main import generate_hybrid
-        _hybrid_router = generate_hybrid
-    return _hybrid_router
+def _get_generators() -> tuple:
+    """Return (generate_hybrid, generate_cactus, generate_cloud), importing main.py once."""
+    global _generators
+    if _generators is None:
+        from main import generate_cactus, generate_cloud, generate_hybrid
+        _generators = (generate_hybrid, generate_cactus, generate_cloud)
+    return _generators
 
 
 # ---------------------------------------------------------------------------
@@ -115,18 +117,42 @@ class SkillInfo(BaseModel):
 # Core chat logic (shared by REST, WebSocket, and Telegram)
 # ---------------------------------------------------------------------------
 
-def process_chat(
-    user_message: str,
-    routing_override: str = "auto",
-    conversation_history: Optional[list] = None,
-) -> dict:
-    """
-    Full pipeline: privacy check → routing → inference → skill execution.
-    Returns a dict suitable for ChatResponse.
-    """
-    start = time.time()
-    registry = get_registry()
+# The core function-calling tools generate_hybrid was designed for. The
+# other skills (web_browse, file_*, calendar_*) are executed as a second
+# pass after the model picks a tool.
+CORE_TOOLS = frozenset({
+    "get_weather", "set_alarm", "send_message", "create_reminder",
+    "search_contacts", "play_music", "set_timer",
+})
+
+_ACTION_WORDS = frozenset({
+    "set", "get", "send", "play", "search", "create", "remind", "what",
+    "weather", "alarm", "timer", "message", "find", "call", "music",
+})
+_REMINDER_WORDS = frozenset({"calendar", "event", "remind", "reminder", "task", "schedule"})
+
+_CLAUSE_SPLIT_RE = re.compile(r'[,;.]\s*')
+_REMINDER_TIME_RE = re.compile(r'(?:at|by)\s+(\d{1,2}[.:]\d{2}\s*(?:am|pm)?|\d{1,2}\s*(?:am|pm))')
+_REMINDER_TITLE_RE = re.compile(r'(?:to|for)\s+(.+?)(?:\s+at\s+|\s+by\s+|$)')
+
+
+# (registry tool list the filter was computed from, filtered CORE_TOOLS list)
+_core_tools_cache: tuple = (None, [])
+
 
+def _core_tool_definitions() -> list:
+    """CORE_TOOLS definitions, re-filtered only when the registry's list changes."""
+    global _core_tools_cache
+    all_tools = get_registry().get_tool_definitions()
+    source, tools = _core_tools_cache
+    if source is not all_tools:
+        tools = [t for t in all_tools if t["name"] in CORE_TOOLS]
+        _core_tools_cache = (all_tools, tools)
+    return tools
+
+
+def _prepare_chat(user_message: str, routing_override: str) -> tuple:
+    """Privacy scan and routing decision; returns (privacy_result, override, messages, tools)."""
     # Phase 0: Privacy scan
     privacy_result = scan_privacy(user_message)
 
@@ -144,80 +170,76 @@ def process_chat(
 
     # Get tool definitions from skill registry — filter to only the core
     # function-calling tools that generate_hybrid was designed for.
-    # The new skills (web_browse, file_*, calendar_*) are executed as a
-    # second pass after the model picks a tool.
-    CORE_TOOLS = {
-        "get_weather", "set_alarm", "send_message", "create_reminder",
-        "search_contacts", "play_music", "set_timer",
-    }
-    all_tools = registry.get_tool_definitions()
-    tools = [t for t in all_tools if t["name"] in CORE_TOOLS]
-
-    # Run inference — acquire lock to serialize Cactus model access
-    generate_hybrid = _get_hybrid_router()
-
-    with _model_lock:
-        if effective_override == "local":
-            # Fast path: skip SmartRouter pre-inference (embeddings, similarity)
-            # and call FunctionGemma directly. ~3x faster for privacy-forced queries.
-            # Extract just the action clause — FunctionGemma 270M can't parse
-            # long multi-clause PII sentences reliably.
-            # Split on comma/period/semicolon and find the clause with action words.
-            _ACTION_WORDS = {"set", "get", "send", "play", "search", "create",
-                             "remind", "what", "weather", "alarm", "timer",
-                             "message", "find", "call", "music"}
-            clauses = re.split(r'[,;.]\s*', user_message)
-            action_clauses = [c for c in clauses
-                              if any(w in c.lower().split() for w in _ACTION_WORDS)]
-            clean_msg = action_clauses[0] if action_clauses else user_message
-            clean_messages = [{"role": "user", "content": clean_msg.strip()}]
-            sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-            from main import generate_cactus
-            local_result = generate_cactus(clean_messages, tools)
-            # If empty, retry with original message
-            if not local_result.get("function_calls"):
-                local_result = generate_cactus(messages, tools)
-            result = {
-                "function_calls": local_result.get("function_calls", []),
-                "total_time_ms": local_result.get("total_time_ms", 0),
-                "confidence": local_result.get("confidence", 0),
-                "source": "on-device (privacy-forced)",
-            }
-        elif effective_override == "cloud":
-            sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
-            from main import generate_cloud
-            result = generate_cloud(messages, tools)
-            result["source"] = "cloud (user-forced)"
-        else:
-            result = generate_hybrid(messages, tools)
+    tools = _core_tool_definitions()
+
+    return privacy_result, effective_override, messages, tools
+
+
+def _run_inference(user_message: str, messages: list, tools: list, effective_override: str) -> dict:
+    """Model inference. Must only run on _inference_executor (Cactus is not thread-safe)."""
+    generate_hybrid, generate_cactus, generate_cloud = _get_generators()
+
+    if effective_override == "local":
+        # Fast path: skip SmartRouter pre-inference (embeddings, similarity)
+        # and call FunctionGemma directly. ~3x faster for privacy-forced queries.
+        # Extract just the action clause — FunctionGemma 270M can't parse
+        # long multi-clause PII sentences reliably.
+        # Split on comma/period/semicolon and find the clause with action words.
+        clauses = _CLAUSE_SPLIT_RE.split(user_message)
+        action_clauses = [c for c in clauses
+                          if not _ACTION_WORDS.isdisjoint(c.lower().split())]
+        clean_msg = action_clauses[0] if action_clauses else user_message
+        clean_messages = [{"role": "user", "content": clean_msg.strip()}]
+        local_result = generate_cactus(clean_messages, tools)
+        # If empty, retry with original message
+        if not local_result.get("function_calls"):
+            local_result = generate_cactus(messages, tools)
+        result = {
+            "function_calls": local_result.get("function_calls", []),
+            "total_time_ms": local_result.get("total_time_ms", 0),
+            "confidence": local_result.get("confidence", 0),
+            "source": "on-device (privacy-forced)",
+        }
+    elif effective_override == "cloud":
+        result = generate_cloud(messages, tools)
+        result["source"] = "cloud (user-forced)"
+    else:
+        result = generate_hybrid(messages, tools)
+    return result
+
+
+def _finish_chat(
+    user_message: str,
+    privacy_result: PrivacyResult,
+    effective_override: str,
+    result: dict,
+    start: float,
+) -> dict:
+    """Post-process function calls, execute skills and build the response dict."""
+    registry = get_registry()
 
     # Post-process: remap set_alarm → create_reminder when query is about
     # calendar events, reminders, or tasks (FunctionGemma often confuses them)
-    _REMINDER_WORDS = {"calendar", "event", "remind", "reminder", "task", "schedule"}
-    lower_msg = user_message.lower()
-    if any(w in lower_msg for w in _REMINDER_WORDS):
-        for fc in result.get("function_calls", []):
-            if fc.get("name") == "set_alarm":
-                # Parse time directly from user query (more reliable than model output)
-                time_match = re.search(
-                    r'(?:at|by)\s+(\d{1,2}[.:]\d{2}\s*(?:am|pm)?|\d{1,2}\s*(?:am|pm))',
-                    lower_msg
-                )
-                time_str = time_match.group(1).replace(".", ":") if time_match else None
-                if not time_str:
-                    # Fall back to model's hour/minute
-                    args = fc.get("arguments", {})
-                    h, m = int(args.get("hour", 0)) % 24, int(args.get("minute", 0))
-                    period = "AM" if h < 12 else "PM"
-                    dh = h if h <= 12 else h - 12
-                    if dh == 0:
-                        dh = 12
-                    time_str = f"{dh}:{m:02d} {period}"
-                # Extract title from query
-                title_match = re.search(r'(?:to|for)\s+(.+?)(?:\s+at\s+|\s+by\s+|$)', lower_msg)
-                title = title_match.group(1).strip() if title_match else "Reminder"
-                fc["name"] = "create_reminder"
-                fc["arguments"] = {"title": title, "time": time_str}
+    alarm_calls = [fc for fc in result.get("function_calls", []) if fc.get("name") == "set_alarm"]
+    lower_msg = user_message.lower() if alarm_calls else ""
+    if alarm_calls and any(w in lower_msg for w in _REMINDER_WORDS):
+        # Parse time and title directly from user query (more reliable than model output)
+        time_match = _REMINDER_TIME_RE.search(lower_msg)
+        title_match = _REMINDER_TITLE_RE.search(lower_msg)
+        title = title_match.group(1).strip() if title_match else "Reminder"
+        for fc in alarm_calls:
+            time_str = time_match.group(1).replace(".", ":") if time_match else None
+            if not time_str:
+                # Fall back to model's hour/minute
+                args = fc.get("arguments", {})
+                h, m = int(args.get("hour", 0)) % 24, int(args.get("minute", 0))
+                period = "AM" if h < 12 else "PM"
+                dh = h if h <= 12 else h - 12
+                if dh == 0:
+                    dh = 12
+                time_str = f"{dh}:{m:02d} {period}"
+            fc["name"] = "create_reminder"
+            fc["arguments"] = {"title": title, "time": time_str}
 
     # Execute skills from function calls
     skill_results = []
@@ -265,6 +287,48 @@ def process_chat(
     }
 
 
+def process_chat(
+    user_message: str,
+    routing_override: str = "auto",
+    conversation_history: Optional[list] = None,
+) -> dict:
+    """
+    Full pipeline: privacy check → routing → inference → skill execution.
+    Returns a dict suitable for ChatResponse.
+
+    Blocking; async callers (the gateway, Telegram) use process_chat_async.
+    """
+    start = time.time()
+    privacy_result, effective_override, messages, tools = _prepare_chat(user_message, routing_override)
+    result = _inference_executor.submit(
+        _run_inference, user_message, messages, tools, effective_override,
+    ).result()
+    return _finish_chat(user_message, privacy_result, effective_override, result, start)
+
+
+async def process_chat_async(
+    user_message: str,
+    routing_override: str = "auto",
+    conversation_history: Optional[list] = None,
+) -> dict:
+    """
+    Async variant of process_chat for the gateway. Only inference is queued
+    on the single model worker; scanning and skill execution use the default
+    pool, so no thread sits blocked waiting for the model.
+    """
+    start = time.time()
+    loop = asyncio.get_running_loop()
+    privacy_result, effective_override, messages, tools = await loop.run_in_executor(
+        None, _prepare_chat, user_message, routing_override,
+    )
+    result = await loop.run_in_executor(
+        _inference_executor, _run_inference, user_message, messages, tools, effective_override,
+    )
+    return await loop.run_in_executor(
+        None, _finish_chat, user_message, privacy_result, effective_override, result, start,
+    )
+
+
 # ---------------------------------------------------------------------------
 # FastAPI app
 # ---------------------------------------------------------------------------
@@ -281,6 +345,7 @@ app = FastAPI(
     description="OpenClaw-inspired agent with confidential privacy layer",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -298,43 +363,40 @@ app.add_middleware(
 
 @app.post("/api/chat", response_model=ChatResponse)
 async def chat_endpoint(req: ChatRequest):
-    loop = asyncio.get_event_loop()
-    result = await loop.run_in_executor(
-        None,
-        process_chat,
-        req.message,
-        req.routing_override.value,
-        None,
-    )
-    return ChatResponse(**result)
+    result = await process_chat_async(req.message, req.routing_override.value)
+    # Return the plain dict: FastAPI validates it against response_model
+    # once, instead of building ChatResponse here, dumping it, and
+    # validating it again.
+    return result
 
 
 @app.get("/api/skills", response_model=List[SkillInfo])
 async def list_skills():
     registry = get_registry()
     return [
-        SkillInfo(
-            name=s.name,
-            description=s.description,
-            parameters=s.parameters,
-        )
+        {"name": s.name, "description": s.description, "parameters": s.parameters}
         for s in registry.list_skills()
     ]
 
 
-@app.post("/api/privacy")
-async def privacy_check(req: PrivacyCheckRequest):
-    result = scan_privacy(req.text)
+def _privacy_report(text: str) -> dict:
+    result = scan_privacy(text)
     return {
         "risk_level": result.risk_level.value,
         "pii_types": result.pii_types,
         "recommendation": result.recommendation,
         "summary": result.summary,
         "pii_count": len(result.pii_found),
-        "redacted": redact_pii(req.text, result),
+        "redacted": redact_pii(text, result),
     }
 
 
+@app.post("/api/privacy")
+async def privacy_check(req: PrivacyCheckRequest):
+    # Scan + redact in a worker thread so long inputs don't stall the event loop
+    return await asyncio.to_thread(_privacy_report, req.text)
+
+
 @app.get("/api/health")
 async def health():
     return {"status": "ok", "skills": len(get_registry().list_skills())}
@@ -344,10 +406,14 @@ async def health():
 # WebSocket for real-time chat
 # ---------------------------------------------------------------------------
 
+_TYPING_FRAME = orjson.dumps({"type": "typing", "status": True}).decode()
+
+
 @app.websocket("/ws")
 async def websocket_chat(ws: WebSocket):
     await ws.accept()
-    conversation_history = []
+    # Keep history manageable: the deque drops the oldest turns itself
+    conversation_history = deque(maxlen=20)
 
     try:
         while True:
@@ -361,27 +427,17 @@ async def websocket_chat(ws: WebSocket):
             override = payload.get("routing_override", "auto")
 
             # Send typing indicator
-            await ws.send_json({"type": "typing", "status": True})
-
-            # Process in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                process_chat,
-                user_msg,
-                override,
-                list(conversation_history),
-            )
+            await ws.send_text(_TYPING_FRAME)
+
+            result = await process_chat_async(user_msg, override, list(conversation_history))
 
             # Update conversation history
             conversation_history.append({"role": "user", "content": user_msg})
             conversation_history.append({"role": "assistant", "content": result["message"]})
 
-            # Keep history manageable
-            if len(conversation_history) > 20:
-                conversation_history = conversation_history[-20:]
-
-            await ws.send_json({"type": "response", **result})
+            # orjson is several times faster than Starlette's json.dumps;
+            # still sent as a text frame since clients JSON.parse(event.data)
+            await ws.send_text(orjson.dumps({"type": "response", **result}).decode())
 
     except WebSocketDisconnect:
         pass
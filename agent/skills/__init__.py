@@ -5,7 +5,7 @@ compatible with generate_hybrid.
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 
 @dataclass
@@ -17,7 +17,11 @@ class SkillResult:
 
 
 class Skill(ABC):
-    """Base class for all agent skills."""
+    """Base class for all agent skills.
+
+    ``name``, ``description`` and ``parameters`` may be plain class
+    attributes; they are read for every tool definition and listing.
+    """
 
     @property
     @abstractmethod
@@ -53,9 +57,15 @@ class SkillRegistry:
 
     def __init__(self):
         self._skills: Dict[str, Skill] = {}
+        self._tool_defs: Optional[List[dict]] = None
 
     def register(self, skill: Skill):
         self._skills[skill.name] = skill
+        self._tool_defs = None
+
+    def register_all(self, skills: Iterable[Skill]):
+        self._skills.update({s.name: s for s in skills})
+        self._tool_defs = None
 
     def get(self, name: str) -> Optional[Skill]:
         return self._skills.get(name)
@@ -64,7 +74,10 @@ class SkillRegistry:
         return list(self._skills.values())
 
     def get_tool_definitions(self) -> List[dict]:
-        return [s.to_tool_definition() for s in self._skills.values()]
+        """Tool definitions for all skills (cached until the next register; treat as read-only)."""
+        if self._tool_defs is None:
+            self._tool_defs = [s.to_tool_definition() for s in self._skills.values()]
+        return self._tool_defs
 
     def execute(self, name: str, arguments: dict) -> SkillResult:
         skill = self._skills.get(name)
@@ -2,58 +2,209 @@
 Alarm and timer skills.
 """
 
-import subprocess
-import platform
+import hashlib
+import sys
+import threading
 
+# subprocess and PyObjC are imported where they are used, so registering
+# the skill does not pay for them off macOS.
 from agent.skills import Skill, SkillResult
+from agent.skills.files import WORKSPACE_DIR
+
+_IS_MACOS = sys.platform == "darwin"
+
+
+# Create a Calendar event with a sound alarm that fires at event time.
+# The notification fallback lives in the same script so only one osascript
+# process is spawned; it exits non-zero when the event could not be made.
+# Values arrive as handler arguments so the source never changes and compiles
+# once; `run` adapts osascript's argv for the subprocess path. The Calendar
+# call is capped by `with timeout` so a hung app errors out (into the
+# notification fallback) before the caller's deadline.
+_ALARM_SCRIPT = '''
+on run argv
+    create_alarm((item 1 of argv) as integer, (item 2 of argv) as integer, item 3 of argv)
+end run
+
+on create_alarm(alarmHour, alarmMinute, timeStr)
+    try
+        with timeout of 8 seconds
+            tell application "Calendar"
+                set calList to name of every calendar
+                if "Home" is in calList then
+                    set targetCal to calendar "Home"
+                else
+                    set targetCal to first calendar
+                end if
+                set targetDate to current date
+                set hours of targetDate to alarmHour
+                set minutes of targetDate to alarmMinute
+                set seconds of targetDate to 0
+                -- If the time has already passed today, set for tomorrow
+                if targetDate < (current date) then
+                    set targetDate to targetDate + 1 * days
+                end if
+                set newEvent to make new event at end of events of targetCal with properties {summary:"SecureClaw Alarm - " & timeStr, start date:targetDate, end date:targetDate + 5 * minutes}
+                make new sound alarm at end of newEvent with properties {trigger interval:0}
+            end tell
+        end timeout
+    on error
+        -- Fallback: show notification
+        display notification "Alarm set for " & timeStr with title "SecureClaw" sound name "Glass"
+        error number 1
+    end try
+end create_alarm
+'''
+
+# Compiled copy keyed by source hash so edits to the script recompile it.
+_SCRIPT_CACHE_DIR = WORKSPACE_DIR / ".cache"
+_COMPILED_SCRIPT = _SCRIPT_CACHE_DIR / (
+    f"alarm-{hashlib.sha1(_ALARM_SCRIPT.encode()).hexdigest()[:12]}.scpt"
+)
+
+
+# Compiled OSAKit script, built on first use; False once OSAKit is known
+# to be unusable so the import and compile are not retried.
+_osa_script = None
+# Held for as long as a handler call runs, including one that blew through
+# its deadline, so a stuck call sends later alarms to osascript instead
+_osa_lock = threading.Lock()
+_IN_PROCESS_TIMEOUT = 10.0
+# Returned by _run_in_process when the handler is still running at the
+# deadline, so whether the event exists is not known yet
+_TIMED_OUT = object()
+
+
+def _load_osa_script() -> bool:
+    global _osa_script
+    if _osa_script is None:
+        try:
+            from OSAKit import OSALanguage, OSAScript
+        except ImportError:  # PyObjC not installed, or not on macOS
+            _osa_script = False
+            return False
+        script = OSAScript.alloc().initWithSource_language_(
+            _ALARM_SCRIPT, OSALanguage.languageForName_("AppleScript")
+        )
+        compiled, _ = script.compileAndReturnError_(None)
+        _osa_script = script if compiled else False
+    return _osa_script is not False
+
+
+def _run_in_process(hour: int, minute: int, time_str: str):
+    """Run the alarm handler through OSAKit.
+
+    Returns True/False for success, or None if OSAKit is unusable or busy
+    and the caller should use osascript. OSAKit calls cannot be cancelled,
+    so the handler runs on a daemon thread and is waited on for at most
+    _IN_PROCESS_TIMEOUT; past that _TIMED_OUT is returned rather than
+    falling back, since the event may still be created.
+    """
+    if _osa_script is False or not _osa_lock.acquire(blocking=False):
+        return None
+    try:
+        usable = _load_osa_script()
+    except Exception:
+        usable = False
+    if not usable:
+        _osa_lock.release()
+        return None
+
+    done = threading.Event()
+    outcome = []
+
+    def call():
+        try:
+            _, error = _osa_script.executeHandlerWithName_arguments_error_(
+                "create_alarm", [hour, minute, time_str], None
+            )
+            outcome.append(error is None)
+        except Exception:
+            outcome.append(None)
+        finally:
+            _osa_lock.release()
+            done.set()
+
+    threading.Thread(target=call, name="alarm-osakit", daemon=True).start()
+    if not done.wait(_IN_PROCESS_TIMEOUT):
+        return _TIMED_OUT
+    return outcome[0]
+
+
+def _run_osa(cmd: list, timeout: float = 10) -> int:
+    """Run an osascript/osacompile command in its own process group.
+
+    On timeout the whole group is terminated (then killed), so helpers the
+    script spawned do not linger, and TimeoutExpired is re-raised.
+    """
+    import os
+    import signal
+    import subprocess
+
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    try:
+        return proc.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+            try:
+                proc.wait(timeout=2)
+            except subprocess.TimeoutExpired:
+                os.killpg(proc.pid, signal.SIGKILL)
+                proc.wait()
+        except ProcessLookupError:
+            pass
+        raise
+
+
+def _alarm_command() -> list:
+    """osascript argv prefix, compiling the alarm script on first use."""
+    if not _COMPILED_SCRIPT.exists():
+        import os
+
+        # Compile beside the final path and rename into place, so a
+        # concurrent alarm never runs a half-written script
+        tmp = _COMPILED_SCRIPT.with_name(
+            f"{_COMPILED_SCRIPT.stem}.{os.getpid()}-{threading.get_ident()}.tmp.scpt"
+        )
+        try:
+            _SCRIPT_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            if _run_osa(["osacompile", "-o", str(tmp), "-e", _ALARM_SCRIPT]) != 0:
+                raise OSError("osacompile failed")
+            os.replace(tmp, _COMPILED_SCRIPT)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            return ["osascript", "-e", _ALARM_SCRIPT]
+    return ["osascript", str(_COMPILED_SCRIPT)]
 
 
 def _set_macos_alarm(hour: int, minute: int) -> tuple:
-    """Create a Calendar event with a sound alarm on macOS."""
+    """Create a Calendar event with a sound alarm on macOS.
+
+    Returns (time_str, created), where created is None if the in-process
+    call timed out and the outcome is unknown.
+    """
     period = "AM" if hour < 12 else "PM"
     display_hour = hour if hour <= 12 else hour - 12
     if display_hour == 0:
         display_hour = 12
     time_str = f"{display_hour}:{minute:02d} {period}"
 
-    # Create a Calendar event with a sound alarm that fires at event time
-    script = f'''
-tell application "Calendar"
-    set calList to name of every calendar
-    if "Home" is in calList then
-        set targetCal to calendar "Home"
-    else
-        set targetCal to first calendar
-    end if
-    set targetDate to current date
-    set hours of targetDate to {hour}
-    set minutes of targetDate to {minute}
-    set seconds of targetDate to 0
-    -- If the time has already passed today, set for tomorrow
-    if targetDate < (current date) then
-        set targetDate to targetDate + 1 * days
-    end if
-    set newEvent to make new event at end of events of targetCal with properties {{summary:"SecureClaw Alarm - {time_str}", start date:targetDate, end date:targetDate + 5 * minutes}}
-    make new sound alarm at end of newEvent with properties {{trigger interval:0}}
-end tell
-'''
     try:
-        result = subprocess.run(
-            ["osascript", "-e", script],
-            capture_output=True, text=True, timeout=10
-        )
-        if result.returncode == 0:
-            return time_str, True
+        created = _run_in_process(hour, minute, time_str)
+        if created is _TIMED_OUT:
+            return time_str, None
+        if created is not None:
+            return time_str, created
     except Exception:
         pass
 
-    # Fallback: show notification
     try:
-        subprocess.run(
-            ["osascript", "-e",
-             f'display notification "Alarm set for {time_str}" with title "SecureClaw" sound name "Glass"'],
-            capture_output=True, timeout=5
-        )
+        if _run_osa(_alarm_command() + [str(hour), str(minute), time_str]) == 0:
+            return time_str, True
     except Exception:
         pass
 
@@ -62,24 +213,16 @@ end tell
 
 class SetAlarmSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "set_alarm"
-
-    @property
-    def description(self) -> str:
-        return "Set an alarm for a given time."
-
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "hour": {"type": "integer", "description": "Hour to set the alarm for (0-23)."},
-                "minute": {"type": "integer", "description": "Minute to set the alarm for (0-59)."},
-            },
-            "required": ["hour", "minute"],
-        }
+    name = "set_alarm"
+    description = "Set an alarm for a given time."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "hour": {"type": "integer", "description": "Hour to set the alarm for (0-23)."},
+            "minute": {"type": "integer", "description": "Minute to set the alarm for (0-59)."},
+        },
+        "required": ["hour", "minute"],
+    }
 
     def execute(self, hour: int, minute: int = 0, **kwargs) -> SkillResult:
         hour = int(hour)
@@ -88,8 +231,18 @@ class SetAlarmSkill(Skill):
         hour = hour % 24
         minute = max(0, min(59, minute))
 
-        if platform.system() == "Darwin":
+        if _IS_MACOS:
             time_str, created = _set_macos_alarm(hour, minute)
+            if created is None:
+                return SkillResult(
+                    success=False,
+                    output=(
+                        f"The alarm for {time_str} may not have been created: Calendar did "
+                        "not respond in time. Check Calendar before setting it again."
+                    ),
+                    error="Calendar timed out.",
+                    data={"hour": hour, "minute": minute, "platform": "macOS", "calendar_event": None},
+                )
             if created:
                 return SkillResult(
                     success=True,
@@ -115,23 +268,15 @@ class SetAlarmSkill(Skill):
 
 class SetTimerSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "set_timer"
-
-    @property
-    def description(self) -> str:
-        return "Set a countdown timer."
-
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "minutes": {"type": "integer", "description": "Number of minutes."},
-            },
-            "required": ["minutes"],
-        }
+    name = "set_timer"
+    description = "Set a countdown timer."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "minutes": {"type": "integer", "description": "Number of minutes."},
+        },
+        "required": ["minutes"],
+    }
 
     def execute(self, minutes: int, **kwargs) -> SkillResult:
         return SkillResult(
@@ -3,21 +3,38 @@ Web browsing skill — fetch and summarize web page content.
 """
 
 import re
-import urllib.request
-import urllib.error
+import threading
+from collections import OrderedDict
+from html import unescape
 from html.parser import HTMLParser
 
+try:
+    # selectolax>=1.0 dropped the Modest backend behind selectolax.parser
+    from selectolax.lexbor import LexborHTMLParser as _FastParser
+except ImportError:
+    _FastParser = None
+
 from agent.skills import Skill, SkillResult
 
 
+class _StopParsing(Exception):
+    """Raised by _TextExtractor once it has collected enough text."""
+
+
 class _TextExtractor(HTMLParser):
-    """Simple HTML-to-text extractor."""
+    """Simple HTML-to-text extractor.
 
-    def __init__(self):
+    With ``limit`` set, parsing stops once that many characters of text
+    have been collected, so long pages cost O(limit) rather than O(page).
+    """
+
+    def __init__(self, limit: int = None):
         super().__init__()
         self._text_parts = []
         self._skip_tags = {"script", "style", "noscript", "svg", "head"}
         self._skip_depth = 0
+        self._limit = limit
+        self._total = 0
 
     def handle_starttag(self, tag, attrs):
         if tag in self._skip_tags:
@@ -32,74 +49,194 @@ class _TextExtractor(HTMLParser):
             text = data.strip()
             if text:
                 self._text_parts.append(text)
+                if self._limit is not None:
+                    self._total += len(text)
+                    if self._total > self._limit:
+                        raise _StopParsing
 
     def get_text(self) -> str:
         return "\n".join(self._text_parts)
 
 
-def _html_to_text(html: str) -> str:
-    extractor = _TextExtractor()
-    extractor.feed(html)
+_SKIP_SELECTOR = "script,style,noscript,svg,head"
+
+_REQUEST_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (compatible; AgentBot/1.0)",
+    "Accept": "text/html,application/xhtml+xml,*/*",
+}
+
+# Never read less than this many bytes of a page, however small max_chars is
+_MIN_READ_BYTES = 64 * 1024
+
+# Runs of 3+ newlines collapse to a blank line, runs of spaces to one space
+_CLEANUP_RE = re.compile(r"(\n{3,})| {2,}")
+
+
+# Regex extraction for small pages when selectolax is missing: drop skipped
+# elements and comments, then treat every remaining tag as a text boundary,
+# matching what _TextExtractor yields for well-formed markup. As in HTML, a
+# "<" only opens a tag when a letter, "/", "!" or "?" follows it, and a ">"
+# inside a quoted attribute value does not close one.
+_REGEX_MAX_HTML = 50_000
+_ATTRS = r"""(?:[^>"']|"[^"]*"|'[^']*')*"""
+_SKIP_BLOCK_RE = re.compile(
+    r"<!--.*?-->|<(script|style|noscript|svg|head)\b" + _ATTRS + r">.*?</\1\s*>",
+    re.S | re.I,
+)
+_TAG_RE = re.compile(r"<(?:[A-Za-z/?]" + _ATTRS + r"|![^>]*)>")
+
+
+def _cleanup_sub(m: re.Match) -> str:
+    return "\n\n" if m.group(1) else " "
+
+
+# Revalidated page cache: url -> (etag, last_modified, max_bytes,
+# bytes_capped, html), least recently used first. Only pages that carry a
+# validator are kept, since they are always re-requested conditionally.
+_PAGE_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+_PAGE_CACHE_SIZE = 64
+_PAGE_CACHE_LOCK = threading.Lock()
+
+
+_session = None
+
+
+def _get_session():
+    """Shared keep-alive session so repeat fetches reuse pooled connections."""
+    global _session
+    if _session is None:
+        import requests
+
+        _session = requests.Session()
+        _session.headers.update(_REQUEST_HEADERS)
+    return _session
+
+
+def _cached_page(url: str, max_bytes: int):
+    with _PAGE_CACHE_LOCK:
+        entry = _PAGE_CACHE.get(url)
+        if entry is None:
+            return None
+        # A capped body is no good to a caller that wants more of the page
+        if entry[3] and entry[2] < max_bytes:
+            return None
+        _PAGE_CACHE.move_to_end(url)
+        return entry
+
+
+def _store_page(url: str, entry: tuple):
+    with _PAGE_CACHE_LOCK:
+        _PAGE_CACHE[url] = entry
+        _PAGE_CACHE.move_to_end(url)
+        if len(_PAGE_CACHE) > _PAGE_CACHE_SIZE:
+            _PAGE_CACHE.popitem(last=False)
+
+
+def _html_to_text(html: str, max_chars: int = None) -> str:
+    if _FastParser is not None:
+        tree = _FastParser(html)
+        for node in tree.css(_SKIP_SELECTOR):
+            node.decompose()
+        root = tree.body if tree.body is not None else tree.root
+        if root is None:
+            return ""
+        # One part per non-blank text node, like _TextExtractor; text()
+        # with a separator also emits the whitespace-only nodes
+        return "\n".join(
+            t for t in (
+                node.text_content.strip()
+                for node in root.traverse(include_text=True)
+                if node.tag == "-text"
+            ) if t
+        )
+
+    if len(html) < _REGEX_MAX_HTML:
+        # A dropped block still separates the text on either side of it
+        pieces = _TAG_RE.split(_SKIP_BLOCK_RE.sub("<br>", html))
+        return "\n".join(t for t in (unescape(p).strip() for p in pieces) if t)
+
+    # Keep some slack over max_chars; whitespace cleanup shrinks the text
+    extractor = _TextExtractor(max_chars * 2 if max_chars is not None else None)
+    try:
+        extractor.feed(html)
+    except _StopParsing:
+        pass
     return extractor.get_text()
 
 
 class BrowseSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "web_browse"
-
-    @property
-    def description(self) -> str:
-        return "Fetch a web page URL and return its text content (summarized)."
-
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "url": {
-                    "type": "string",
-                    "description": "The URL to fetch and read.",
-                },
-                "max_chars": {
-                    "type": "integer",
-                    "description": "Maximum characters to return (default 3000).",
-                },
+    name = "web_browse"
+    description = "Fetch a web page URL and return its text content (summarized)."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "url": {
+                "type": "string",
+                "description": "The URL to fetch and read.",
             },
-            "required": ["url"],
-        }
+            "max_chars": {
+                "type": "integer",
+                "description": "Maximum characters to return (default 3000).",
+            },
+        },
+        "required": ["url"],
+    }
 
     def execute(self, url: str, max_chars: int = 3000, **kwargs) -> SkillResult:
         if not url.startswith(("http://", "https://")):
             url = "https://" + url
 
+        # Text is a fraction of the markup, so ~8 bytes per returned char is
+        # plenty; anything past that would be parsed only to be truncated.
+        max_bytes = max(_MIN_READ_BYTES, max_chars * 8)
+
+        # requests pulls in urllib3/ssl; only load it when fetching
+        import requests
+
+        headers = None
+        cached = _cached_page(url, max_bytes)
+        if cached is not None:
+            headers = {}
+            if cached[0]:
+                headers["If-None-Match"] = cached[0]
+            if cached[1]:
+                headers["If-Modified-Since"] = cached[1]
+
         try:
-            req = urllib.request.Request(url, headers={
-                "User-Agent": "Mozilla/5.0 (compatible; AgentBot/1.0)",
-                "Accept": "text/html,application/xhtml+xml,*/*",
-            })
-            with urllib.request.urlopen(req, timeout=15) as resp:
-                content_type = resp.headers.get("Content-Type", "")
-                raw = resp.read()
-
-                # Detect encoding
-                encoding = "utf-8"
-                if "charset=" in content_type:
-                    encoding = content_type.split("charset=")[-1].split(";")[0].strip()
-
-                html = raw.decode(encoding, errors="replace")
-
-        except urllib.error.HTTPError as e:
+            with _get_session().get(url, headers=headers, timeout=15, stream=True) as resp:
+                if resp.status_code == 304 and cached is not None:
+                    # Not modified: reuse the cached body
+                    bytes_capped, html = cached[3], cached[4]
+                else:
+                    resp.raise_for_status()
+                    content_type = resp.headers.get("Content-Type", "")
+                    raw = resp.raw.read(max_bytes + 1, decode_content=True)
+                    bytes_capped = len(raw) > max_bytes
+                    raw = raw[:max_bytes]
+
+                    # Detect encoding
+                    encoding = "utf-8"
+                    if "charset=" in content_type:
+                        encoding = content_type.split("charset=")[-1].split(";")[0].strip()
+
+                    html = raw.decode(encoding, errors="replace")
+
+                    etag = resp.headers.get("ETag")
+                    last_modified = resp.headers.get("Last-Modified")
+                    if etag or last_modified:
+                        _store_page(url, (etag, last_modified, max_bytes, bytes_capped, html))
+
+        except requests.HTTPError as e:
             return SkillResult(
                 success=False,
-                output=f"HTTP error {e.code}: {e.reason}",
+                output=f"HTTP error {e.response.status_code}: {e.response.reason}",
                 error=str(e),
             )
-        except urllib.error.URLError as e:
+        except (requests.ConnectionError, requests.Timeout) as e:
             return SkillResult(
                 success=False,
-                output=f"URL error: {e.reason}",
+                output=f"URL error: {e}",
                 error=str(e),
             )
         except Exception as e:
@@ -110,11 +247,10 @@ class BrowseSkill(Skill):
             )
 
         # Extract text
-        text = _html_to_text(html)
+        text = _html_to_text(html, max_chars)
 
         # Clean up excessive whitespace
-        text = re.sub(r"\n{3,}", "\n\n", text)
-        text = re.sub(r" {2,}", " ", text)
+        text = _CLEANUP_RE.sub(_cleanup_sub, text)
 
         # Truncate
         if len(text) > max_chars:
@@ -123,5 +259,5 @@ class BrowseSkill(Skill):
         return SkillResult(
             success=True,
             output=text,
-            data={"url": url, "length": len(text)},
+            data={"url": url, "length": len(text), "bytes_capped": bytes_capped},
         )
@@ -1,80 +1,174 @@
 """
-Calendar manager skill — local JSON-backed calendar with add/list/delete.
+Calendar manager skill — local JSON Lines-backed calendar with add/list/delete.
 """
 
 import json
 import os
 import uuid
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode("utf-8")
+
+    _loads = json.loads
+
 from agent.skills import Skill, SkillResult
 
-CALENDAR_FILE = Path.home() / "agent-workspace" / ".calendar.json"
+# One event per line so adding an event is a single append
+CALENDAR_FILE = Path.home() / "agent-workspace" / ".calendar.jsonl"
+# Pre-JSON Lines store (a single JSON array), converted on first load
+_LEGACY_CALENDAR_FILE = Path.home() / "agent-workspace" / ".calendar.json"
 
 
-def _load_events() -> list:
-    if CALENDAR_FILE.exists():
+# Last parsed calendar, reused while the file's (mtime, size) stamp is
+# unchanged, plus an index of the same events by date for filtered listings.
+# Size is part of the stamp because appends on coarse-mtime filesystems can
+# land within the same tick.
+_CACHE = {"stamp": None, "events": [], "by_date": {}}
+
+
+def _stamp(st: os.stat_result) -> tuple:
+    return st.st_mtime_ns, st.st_size
+
+
+def _lock(f):
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+
+
+def _set_cache(stamp, events: list):
+    by_date = defaultdict(list)
+    for e in events:
+        by_date[e.get("date", "")].append(e)
+    _CACHE.update(stamp=stamp, events=events, by_date=by_date)
+
+
+def _parse_lines(raw: bytes) -> list:
+    events = []
+    for line in raw.splitlines():
+        if line.strip():
+            try:
+                events.append(_loads(line))
+            except json.JSONDecodeError:
+                continue  # skip a torn or hand-mangled line, keep the rest
+    return events
+
+
+def _migrate_legacy():
+    if CALENDAR_FILE.exists() or not _LEGACY_CALENDAR_FILE.exists():
+        return
+    try:
+        events = _loads(_LEGACY_CALENDAR_FILE.read_bytes())
+    except (json.JSONDecodeError, OSError):
+        return
+    _save_events(events)
+    _LEGACY_CALENDAR_FILE.rename(_LEGACY_CALENDAR_FILE.with_suffix(".json.bak"))
+
+
+def _cached_calendar() -> dict:
+    try:
+        stamp = _stamp(CALENDAR_FILE.stat())
+    except OSError:
+        _migrate_legacy()
         try:
-            return json.loads(CALENDAR_FILE.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            return []
-    return []
+            stamp = _stamp(CALENDAR_FILE.stat())
+        except OSError:
+            _set_cache(None, [])
+            return _CACHE
+    if _CACHE["stamp"] != stamp:
+        try:
+            events = _parse_lines(CALENDAR_FILE.read_bytes())
+        except OSError:
+            events = []
+        _set_cache(stamp, events)
+    return _CACHE
+
+
+def _load_events() -> list:
+    # Callers mutate the returned list, so hand out a copy
+    return list(_cached_calendar()["events"])
+
+
+def _append_event(event: dict):
+    _cached_calendar()  # make sure a legacy store has been converted first
+    CALENDAR_FILE.parent.mkdir(parents=True, exist_ok=True)
+    with CALENDAR_FILE.open("ab") as f:
+        _lock(f)
+        fresh = _CACHE["stamp"] is not None and _stamp(os.fstat(f.fileno())) == _CACHE["stamp"]
+        f.write(_dumps(event) + b"\n")
+        f.flush()
+        stamp = _stamp(os.fstat(f.fileno()))
+    if fresh:
+        _CACHE["events"].append(event)
+        _CACHE["by_date"][event.get("date", "")].append(event)
+        _CACHE["stamp"] = stamp
+    else:
+        _CACHE["stamp"] = None  # someone else wrote too; reparse next time
 
 
 def _save_events(events: list):
+    """Rewrite the whole store (used by delete and migration)."""
     CALENDAR_FILE.parent.mkdir(parents=True, exist_ok=True)
-    CALENDAR_FILE.write_text(json.dumps(events, indent=2), encoding="utf-8")
+    with CALENDAR_FILE.open("ab") as f:
+        _lock(f)
+        f.truncate(0)
+        f.write(b"".join(_dumps(e) + b"\n" for e in events))
+        f.flush()
+        stamp = _stamp(os.fstat(f.fileno()))
+    _set_cache(stamp, list(events))
 
 
 class CalendarAddSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "calendar_add"
-
-    @property
-    def description(self) -> str:
-        return "Add an event to the calendar with a title, date, and optional time and description."
-
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "title": {
-                    "type": "string",
-                    "description": "Event title.",
-                },
-                "date": {
-                    "type": "string",
-                    "description": "Event date (e.g. '2026-02-21' or 'tomorrow').",
-                },
-                "time": {
-                    "type": "string",
-                    "description": "Event time (e.g. '3:00 PM'). Optional.",
-                },
-                "description": {
-                    "type": "string",
-                    "description": "Event description. Optional.",
-                },
+    name = "calendar_add"
+    description = "Add an event to the calendar with a title, date, and optional time and description."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "title": {
+                "type": "string",
+                "description": "Event title.",
             },
-            "required": ["title", "date"],
-        }
+            "date": {
+                "type": "string",
+                "description": "Event date (e.g. '2026-02-21' or 'tomorrow').",
+            },
+            "time": {
+                "type": "string",
+                "description": "Event time (e.g. '3:00 PM'). Optional.",
+            },
+            "description": {
+                "type": "string",
+                "description": "Event description. Optional.",
+            },
+        },
+        "required": ["title", "date"],
+    }
 
     def execute(self, title: str, date: str, time: str = "", description: str = "", **kwargs) -> SkillResult:
-        events = _load_events()
         event = {
-            "id": str(uuid.uuid4())[:8],
+            "id": uuid.uuid4().hex[:8],
             "title": title,
             "date": date,
             "time": time,
             "description": description,
             "created_at": datetime.now().isoformat(),
         }
-        events.append(event)
-        _save_events(events)
+        _append_event(event)
         time_str = f" at {time}" if time else ""
         return SkillResult(
             success=True,
@@ -85,34 +179,28 @@ class CalendarAddSkill(Skill):
 
 class CalendarListSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "calendar_list"
-
-    @property
-    def description(self) -> str:
-        return "List upcoming calendar events, optionally filtered by date."
-
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "date": {
-                    "type": "string",
-                    "description": "Filter events by date (e.g. '2026-02-21'). Optional — lists all if omitted.",
-                },
+    name = "calendar_list"
+    description = "List upcoming calendar events, optionally filtered by date."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "date": {
+                "type": "string",
+                "description": "Filter events by date (e.g. '2026-02-21'). Optional — lists all if omitted.",
             },
-            "required": [],
-        }
+        },
+        "required": [],
+    }
 
     def execute(self, date: str = "", **kwargs) -> SkillResult:
-        events = _load_events()
+        # Read-only here, so use the cached lists directly
+        calendar = _cached_calendar()
+        events = calendar["events"]
         if not events:
             return SkillResult(success=True, output="No events on the calendar.")
 
         if date:
-            events = [e for e in events if e.get("date", "") == date]
+            events = calendar["by_date"].get(date, [])
             if not events:
                 return SkillResult(success=True, output=f"No events on {date}.")
 
@@ -131,26 +219,18 @@ class CalendarListSkill(Skill):
 
 class CalendarDeleteSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "calendar_delete"
-
-    @property
-    def description(self) -> str:
-        return "Delete a calendar event by its ID."
-
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "event_id": {
-                    "type": "string",
-                    "description": "The ID of the event to delete.",
-                },
+    name = "calendar_delete"
+    description = "Delete a calendar event by its ID."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "event_id": {
+                "type": "string",
+                "description": "The ID of the event to delete.",
             },
-            "required": ["event_id"],
-        }
+        },
+        "required": ["event_id"],
+    }
 
     def execute(self, event_id: str, **kwargs) -> SkillResult:
         events = _load_events()
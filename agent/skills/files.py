@@ -8,6 +8,8 @@ from pathlib import Path
 from agent.skills import Skill, SkillResult
 
 WORKSPACE_DIR = Path.home() / "agent-workspace"
+_WORKSPACE_RESOLVED = WORKSPACE_DIR.resolve()
+_MAX_READ_CHARS = 10000
 
 
 def _ensure_workspace():
@@ -17,51 +19,49 @@ def _ensure_workspace():
 def _safe_path(filename: str) -> Path:
     """Resolve filename within the sandbox, preventing path traversal."""
     resolved = (WORKSPACE_DIR / filename).resolve()
-    if not str(resolved).startswith(str(WORKSPACE_DIR.resolve())):
+    # Component-wise check; a string prefix would also admit siblings such
+    # as ~/agent-workspace-other
+    if not resolved.is_relative_to(_WORKSPACE_RESOLVED):
         raise ValueError(f"Path traversal blocked: {filename}")
     return resolved
 
 
 class FileReadSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "file_read"
-
-    @property
-    def description(self) -> str:
-        return "Read the contents of a file from the agent workspace."
-
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "filename": {
-                    "type": "string",
-                    "description": "Name or relative path of the file to read.",
-                },
+    name = "file_read"
+    description = "Read the contents of a file from the agent workspace."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "filename": {
+                "type": "string",
+                "description": "Name or relative path of the file to read.",
             },
-            "required": ["filename"],
-        }
+        },
+        "required": ["filename"],
+    }
 
     def execute(self, filename: str, **kwargs) -> SkillResult:
         _ensure_workspace()
         try:
             path = _safe_path(filename)
-            if not path.exists():
+            try:
+                size = path.stat().st_size
+            except FileNotFoundError:
                 return SkillResult(
                     success=False,
                     output=f"File not found: {filename}",
                     error="File does not exist.",
                 )
-            content = path.read_text(encoding="utf-8", errors="replace")
-            if len(content) > 10000:
-                content = content[:10000] + "\n\n[... truncated at 10000 chars]"
+            # Read one char past the cap so huge files never load in full
+            with path.open("r", encoding="utf-8", errors="replace") as f:
+                content = f.read(_MAX_READ_CHARS + 1)
+            if len(content) > _MAX_READ_CHARS:
+                content = content[:_MAX_READ_CHARS] + f"\n\n[... truncated at {_MAX_READ_CHARS} chars]"
             return SkillResult(
                 success=True,
                 output=content,
-                data={"filename": filename, "size": path.stat().st_size},
+                data={"filename": filename, "size": size},
             )
         except ValueError as e:
             return SkillResult(success=False, output=str(e), error=str(e))
@@ -71,34 +71,26 @@ class FileReadSkill(Skill):
 
 class FileWriteSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "file_write"
-
-    @property
-    def description(self) -> str:
-        return "Write content to a file in the agent workspace."
-
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "filename": {
-                    "type": "string",
-                    "description": "Name or relative path of the file to write.",
-                },
-                "content": {
-                    "type": "string",
-                    "description": "Content to write to the file.",
-                },
-                "append": {
-                    "type": "string",
-                    "description": "Set to 'true' to append instead of overwrite.",
-                },
+    name = "file_write"
+    description = "Write content to a file in the agent workspace."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "filename": {
+                "type": "string",
+                "description": "Name or relative path of the file to write.",
             },
-            "required": ["filename", "content"],
-        }
+            "content": {
+                "type": "string",
+                "description": "Content to write to the file.",
+            },
+            "append": {
+                "type": "string",
+                "description": "Set to 'true' to append instead of overwrite.",
+            },
+        },
+        "required": ["filename", "content"],
+    }
 
     def execute(self, filename: str, content: str, append: str = "false", **kwargs) -> SkillResult:
         _ensure_workspace()
@@ -106,7 +98,8 @@ class FileWriteSkill(Skill):
             path = _safe_path(filename)
             path.parent.mkdir(parents=True, exist_ok=True)
             mode = "a" if append.lower() == "true" else "w"
-            path.write_text(content, encoding="utf-8") if mode == "w" else path.open("a").write(content)
+            with path.open(mode, encoding="utf-8") as f:
+                f.write(content)
             return SkillResult(
                 success=True,
                 output=f"Written {len(content)} chars to {filename}.",
@@ -120,26 +113,18 @@ class FileWriteSkill(Skill):
 
 class FileListSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "file_list"
-
-    @property
-    def description(self) -> str:
-        return "List files in the agent workspace directory."
-
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "path": {
-                    "type": "string",
-                    "description": "Subdirectory to list (default: root of workspace).",
-                },
+    name = "file_list"
+    description = "List files in the agent workspace directory."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "path": {
+                "type": "string",
+                "description": "Subdirectory to list (default: root of workspace).",
             },
-            "required": [],
-        }
+        },
+        "required": [],
+    }
 
     def execute(self, path: str = "", **kwargs) -> SkillResult:
         _ensure_workspace()
@@ -151,14 +136,17 @@ class FileListSkill(Skill):
                     output=f"Not a directory: {path}",
                     error="Path is not a directory.",
                 )
+            # DirEntry caches the type (and stat) from the directory read
+            rel_dir = target.relative_to(WORKSPACE_DIR)
+            prefix = f"{rel_dir}{os.sep}" if rel_dir.parts else ""
+            with os.scandir(target) as it:
+                items = sorted(it, key=lambda e: e.name)
             entries = []
-            for item in sorted(target.iterdir()):
-                rel = item.relative_to(WORKSPACE_DIR)
+            for item in items:
                 if item.is_dir():
-                    entries.append(f"📁 {rel}/")
+                    entries.append(f"📁 {prefix}{item.name}/")
                 else:
-                    size = item.stat().st_size
-                    entries.append(f"📄 {rel} ({size} bytes)")
+                    entries.append(f"📄 {prefix}{item.name} ({item.stat().st_size} bytes)")
             if not entries:
                 return SkillResult(success=True, output="Workspace is empty.")
             return SkillResult(
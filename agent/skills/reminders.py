@@ -2,39 +2,157 @@
 Reminder and music skills.
 """
 
-import platform
-import re
-import subprocess
+import sys
+import threading
+import time
+from functools import lru_cache
 
 from agent.skills import Skill, SkillResult
 
+_IS_MACOS = sys.platform == "darwin"
 
+# Long-lived `osascript -i` that reminder scripts are fed to, so each
+# reminder skips the osascript process start. Started on first use.
+_osa_proc = None
+_osa_lock = threading.Lock()
+# Spelled as a concatenation in the script so error messages that echo the
+# source can never contain the finished marker.
+_OSA_OK = b"__secureclaw_ok__"
+_OSA_FAIL = b"__secureclaw_fail__"
+# A fresh coprocess must echo a marker within this long before any reminder
+# is sent to it. If it doesn't (e.g. osascript buffers or stays quiet when
+# stdout is a pipe), the coprocess is given up for good and reminders use
+# one-shot osascript, so a quiet REPL can't turn every reminder into a
+# 10 s timeout.
+_HANDSHAKE_TIMEOUT = 3.0
+_osa_unusable = False
+
+
+@lru_cache(maxsize=256)
 def _parse_time_str(time_str: str) -> tuple:
-    """Parse a time string like '3pm', '3:00 PM', '15:30' into (hour, minute)."""
-    time_str = time_str.strip().upper()
-    # Try HH:MM AM/PM
-    m = re.match(r'(\d{1,2}):(\d{2})\s*(AM|PM)?', time_str)
-    if m:
-        h, mi = int(m.group(1)), int(m.group(2))
-        if m.group(3) == "PM" and h != 12:
-            h += 12
-        elif m.group(3) == "AM" and h == 12:
-            h = 0
-        return h, mi
-    # Try Ham/Hpm
-    m = re.match(r'(\d{1,2})\s*(AM|PM)', time_str)
-    if m:
-        h = int(m.group(1))
-        if m.group(2) == "PM" and h != 12:
+    """Parse a time string like '3pm', '3:00 PM', '15:30' into (hour, minute).
+
+    Accepts a leading ``H[H][:MM]`` followed by optional whitespace and
+    AM/PM; a bare hour needs the AM/PM. Scanned by hand rather than with
+    a regex since the grammar is this small. Results are memoised, as
+    bulk imports repeat the same handful of times.
+    """
+    s = time_str.strip().upper()
+    if not s[:1].isdecimal():
+        return None, None
+    i = 2 if s[1:2].isdecimal() else 1
+    h = int(s[:i])
+
+    minute = None
+    if s[i:i + 1] == ":":
+        mm = s[i + 1:i + 3]
+        if len(mm) == 2 and mm.isdecimal():
+            minute = int(mm)
+            i += 3
+
+    period = s[i:].lstrip()[:2]
+    if period == "PM":
+        if h != 12:
             h += 12
-        elif m.group(2) == "AM" and h == 12:
+    elif period == "AM":
+        if h == 12:
             h = 0
-        return h, 0
-    # Try 24h
-    m = re.match(r'(\d{1,2}):(\d{2})', time_str)
-    if m:
-        return int(m.group(1)), int(m.group(2))
-    return None, None
+    elif minute is None:
+        return None, None
+    return h, minute if minute is not None else 0
+
+
+def _applescript_string(text: str) -> str:
+    return '"' + text.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+
+
+def _kill_coprocess():
+    global _osa_proc
+    import os
+    import signal
+
+    try:
+        os.killpg(_osa_proc.pid, signal.SIGKILL)
+        _osa_proc.wait(timeout=2)
+    except Exception:
+        pass
+    _osa_proc = None
+
+
+def _read_marker(deadline: float) -> bytes:
+    """Read coprocess output until a finished marker shows up."""
+    import os
+    import select
+
+    fd = _osa_proc.stdout.fileno()
+    out = b""
+    while _OSA_OK not in out and _OSA_FAIL not in out:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+            raise TimeoutError("osascript coprocess did not answer")
+        chunk = os.read(fd, 4096)
+        if not chunk:
+            raise EOFError("osascript coprocess exited")
+        out += chunk
+    return out
+
+
+def _start_coprocess() -> bool:
+    """Start `osascript -i` and check it answers over the pipe."""
+    global _osa_proc, _osa_unusable
+    import subprocess
+
+    _osa_proc = subprocess.Popen(
+        ["osascript", "-i"],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT, start_new_session=True,
+    )
+    try:
+        _osa_proc.stdin.write(b'"__secureclaw_" & "ok__"\n')
+        _osa_proc.stdin.flush()
+        if _OSA_OK in _read_marker(time.monotonic() + _HANDSHAKE_TIMEOUT):
+            return True
+    except Exception:
+        pass
+    _kill_coprocess()
+    _osa_unusable = True
+    return False
+
+
+def _run_in_coprocess(script: str, timeout: float = 10.0):
+    """Run script in the shared osascript REPL.
+
+    Returns True/False for success, or None if the coprocess could not be
+    used (failed to start, failed the handshake, or exited) and the caller
+    should fall back to a one-shot osascript. A timeout on a coprocess that
+    passed the handshake counts as failure rather than falling back, since
+    the script may still have created the event.
+    """
+    if _osa_unusable:
+        return None
+
+    # One REPL line; `run script` takes the whole multi-line source at once
+    wrapped = (
+        f"try\n{script}\n\"__secureclaw_\" & \"ok__\"\n"
+        "on error\n\"__secureclaw_\" & \"fail__\"\nend try"
+    )
+    line = f"run script {_applescript_string(wrapped)}\n".encode("utf-8")
+
+    with _osa_lock:
+        try:
+            if _osa_proc is None or _osa_proc.poll() is not None:
+                if not _start_coprocess():
+                    return None
+            _osa_proc.stdin.write(line)
+            _osa_proc.stdin.flush()
+            return _OSA_OK in _read_marker(time.monotonic() + timeout)
+        except TimeoutError:
+            _kill_coprocess()
+            return False
+        except Exception:
+            if _osa_proc is not None:
+                _kill_coprocess()
+            return None
 
 
 def _create_macos_reminder(title: str, hour: int, minute: int) -> bool:
@@ -64,6 +182,12 @@ tell application "Calendar"
     make new display alarm at end of newEvent with properties {{trigger interval:0}}
 end tell
 '''
+    created = _run_in_coprocess(script)
+    if created is not None:
+        return created
+
+    import subprocess
+
     try:
         result = subprocess.run(
             ["osascript", "-e", script],
@@ -76,24 +200,16 @@ end tell
 
 class CreateReminderSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "create_reminder"
-
-    @property
-    def description(self) -> str:
-        return "Create a reminder with a title and time."
-
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "title": {"type": "string", "description": "Reminder title."},
-                "time": {"type": "string", "description": "Time for the reminder (e.g. '3:00 PM')."},
-            },
-            "required": ["title", "time"],
-        }
+    name = "create_reminder"
+    description = "Create a reminder with a title and time."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "title": {"type": "string", "description": "Reminder title."},
+            "time": {"type": "string", "description": "Time for the reminder (e.g. '3:00 PM')."},
+        },
+        "required": ["title", "time"],
+    }
 
     def execute(self, title: str = "Reminder", time: str = "", **kwargs) -> SkillResult:
         if not time:
@@ -104,7 +220,7 @@ class CreateReminderSkill(Skill):
             )
 
         hour, minute = _parse_time_str(time)
-        if hour is not None and platform.system() == "Darwin":
+        if hour is not None and _IS_MACOS:
             created = _create_macos_reminder(title, hour, minute)
             period = "AM" if hour < 12 else "PM"
             dh = hour if hour <= 12 else hour - 12
@@ -127,23 +243,15 @@ class CreateReminderSkill(Skill):
 
 class PlayMusicSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "play_music"
-
-    @property
-    def description(self) -> str:
-        return "Play a song or playlist."
-
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "song": {"type": "string", "description": "Song or playlist name."},
-            },
-            "required": ["song"],
-        }
+    name = "play_music"
+    description = "Play a song or playlist."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "song": {"type": "string", "description": "Song or playlist name."},
+        },
+        "required": ["song"],
+    }
 
     def execute(self, song: str, **kwargs) -> SkillResult:
         return SkillResult(
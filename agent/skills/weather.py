@@ -2,45 +2,77 @@
 Weather skill — wraps the get_weather tool definition.
 """
 
-import json
-import urllib.request
-import urllib.error
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import quote
 
 from agent.skills import Skill, SkillResult
 
+_CACHE_TTL = 300.0
+_CACHE_SIZE = 64
+
+_session = None
+
+
+def _get_session():
+    """Shared keep-alive session so repeat lookups reuse the wttr.in connection."""
+    global _session
+    if _session is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        _session = requests.Session()
+        _session.headers.update({"User-Agent": "curl/7.0", "Accept": "application/json"})
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+    return _session
+
 
 class WeatherSkill(Skill):
 
-    @property
-    def name(self) -> str:
-        return "get_weather"
+    name = "get_weather"
+    description = "Get current weather for a location."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "location": {"type": "string", "description": "City name"},
+        },
+        "required": ["location"],
+    }
 
-    @property
-    def description(self) -> str:
-        return "Get current weather for a location."
+    def __init__(self):
+        # location key -> (fetched_at, current_condition), oldest first
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
 
-    @property
-    def parameters(self) -> dict:
-        return {
-            "type": "object",
-            "properties": {
-                "location": {"type": "string", "description": "City name"},
-            },
-            "required": ["location"],
-        }
+    def _current_condition(self, location: str) -> dict:
+        """Current conditions for a location, reusing lookups from the last 5 minutes."""
+        key = location.strip().lower()
+        now = time.monotonic()
+        with self._cache_lock:
+            hit = self._cache.get(key)
+            if hit is not None and now - hit[0] < _CACHE_TTL:
+                self._cache.move_to_end(key)
+                return hit[1]
 
-    def execute(self, location: str, **kwargs) -> SkillResult:
         # Use wttr.in for a free, no-API-key weather service
+        resp = _get_session().get(f"https://wttr.in/{quote(location)}?format=j1", timeout=10)
+        resp.raise_for_status()
+        data = resp.json()
+        current = data.get("current_condition", [{}])[0]
+
+        with self._cache_lock:
+            self._cache[key] = (now, current)
+            self._cache.move_to_end(key)
+            if len(self._cache) > _CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return current
+
+    def execute(self, location: str, **kwargs) -> SkillResult:
         try:
-            url = f"https://wttr.in/{urllib.request.quote(location)}?format=j1"
-            req = urllib.request.Request(url, headers={
-                "User-Agent": "curl/7.0",
-                "Accept": "application/json",
-            })
-            with urllib.request.urlopen(req, timeout=10) as resp:
-                data = json.loads(resp.read().decode("utf-8"))
-
-            current = data.get("current_condition", [{}])[0]
+            current = self._current_condition(location)
             temp_c = current.get("temp_C", "?")
             temp_f = current.get("temp_F", "?")
             desc = current.get("weatherDesc", [{}])[0].get("value", "Unknown")
@@ -12,12 +12,11 @@ Commands:
 Regular messages go through: privacy check → hybrid router → skill execution.
 """
 
-import asyncio
 import logging
 import os
 import sys
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict
 
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import (
@@ -35,87 +34,110 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 os.environ.setdefault("CACTUS_NO_CLOUD_TELE", "1")
 
 from agent.privacy import scan_privacy, RiskLevel
-from agent.server import process_chat, _register_all_skills
+from agent.server import process_chat_async, _register_all_skills
+from agent.skills import get_registry
 
 logger = logging.getLogger(__name__)
 
-# Per-user routing override state
-_user_overrides: Dict[int, str] = {}
+# Per-user routing override state: user id -> mode, least recently used
+# first. Capped by size rather than age, so an override in active use is
+# never silently reset; only the longest-idle users fall back to auto.
+_user_overrides: "OrderedDict[int, str]" = OrderedDict()
+_MAX_OVERRIDES = 10_000
+
+
+def _override_for(user_id: int) -> str:
+    mode = _user_overrides.get(user_id)
+    if mode is None:
+        return "auto"
+    _user_overrides.move_to_end(user_id)
+    return mode
+
+
+def _set_override(user_id: int, mode: str):
+    _user_overrides[user_id] = mode
+    _user_overrides.move_to_end(user_id)
+    if len(_user_overrides) > _MAX_OVERRIDES:
+        _user_overrides.popitem(last=False)
 
 
 # ---------------------------------------------------------------------------
 # Formatting helpers
 # ---------------------------------------------------------------------------
 
+_PRIVACY_BADGES = {
+    "low": "🟢 Low Risk",
+    "medium": "🟡 Medium Risk",
+    "high": "🔴 High Risk",
+}
+
+# Checked in order; the first token found in the source string wins
+_ROUTING_TOKENS = (
+    ("on-device", "📱 On-Device"),
+    ("local", "📱 On-Device"),
+    ("cloud", "☁️ Cloud"),
+)
+
+
 def _privacy_badge(risk_level: str) -> str:
-    badges = {
-        "low": "🟢 Low Risk",
-        "medium": "🟡 Medium Risk",
-        "high": "🔴 High Risk",
-    }
-    return badges.get(risk_level, "⚪ Unknown")
+    return _PRIVACY_BADGES.get(risk_level, "⚪ Unknown")
 
 
 def _routing_badge(source: str) -> str:
-    if "on-device" in source or "local" in source:
-        return "📱 On-Device"
-    elif "cloud" in source:
-        return "☁️ Cloud"
+    for token, badge in _ROUTING_TOKENS:
+        if token in source:
+            return badge
     return "❓ Unknown"
 
 
+def _chunks(text: str, size: int = 4000):
+    """Yield pieces of at most size chars, preferring to break after a newline."""
+    start = 0
+    n = len(text)
+    while start < n:
+        end = min(start + size, n)
+        if end < n:
+            # Only take the newline if it keeps the piece at least half full
+            nl = text.rfind("\n", start, end)
+            if nl - start > size // 2:
+                end = nl + 1
+        yield text[start:end]
+        start = end
+
+
 def _format_response(result: dict) -> str:
     """Format a chat result into a Telegram-friendly message."""
-    parts = []
-
-    # Privacy badge
     privacy = result.get("privacy", {})
-    risk = privacy.get("risk_level", "low")
-    parts.append(f"{_privacy_badge(risk)}")
-
-    if privacy.get("pii_types"):
-        parts.append(f"⚠️ PII detected: {', '.join(privacy['pii_types'])}")
+    pii_types = privacy.get("pii_types")
+    pii_line = f"\n⚠️ PII detected: {', '.join(pii_types)}" if pii_types else ""
 
-    # Routing info
-    routing = result.get("routing", {})
-    source = routing.get("source", "unknown")
-    parts.append(f"{_routing_badge(source)} | {result.get('total_time_ms', 0):.0f}ms")
+    source = result.get("routing", {}).get("source", "unknown")
 
-    parts.append("")  # blank line
-
-    # Main response
-    parts.append(result.get("message", "No response."))
-
-    # Function calls summary
     fcs = result.get("function_calls", [])
-    if fcs:
-        parts.append("")
-        parts.append(f"🔧 Tools called: {', '.join(fc.get('name', '?') for fc in fcs)}")
+    fc_line = f"\n\n🔧 Tools called: {', '.join([fc.get('name', '?') for fc in fcs])}" if fcs else ""
 
-    return "\n".join(parts)
+    return (
+        f"{_privacy_badge(privacy.get('risk_level', 'low'))}{pii_line}\n"
+        f"{_routing_badge(source)} | {result.get('total_time_ms', 0):.0f}ms\n"
+        f"\n"
+        f"{result.get('message', 'No response.')}{fc_line}"
+    )
 
 
 # ---------------------------------------------------------------------------
 # Command handlers
 # ---------------------------------------------------------------------------
 
-async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    from agent.skills import get_registry
-    registry = get_registry()
-    skills = registry.list_skills()
-
-    text = (
+def _build_command_texts(skills) -> tuple:
+    """Render the /start and /skills replies for a list of skills."""
+    start_text = (
         "🛡️ *Privacy-First Hybrid Agent*\n\n"
         "I'm an intelligent assistant that protects your privacy. "
         "Sensitive prompts are automatically processed on-device using FunctionGemma, "
         "while complex tasks use Gemini cloud — you're always in control.\n\n"
         f"*{len(skills)} skills available:*\n"
-    )
-    for s in skills:
-        text += f"  • `{s.name}` — {s.description}\n"
-
-    text += (
-        "\n*Commands:*\n"
+        + "".join(f"  • `{s.name}` — {s.description}\n" for s in skills)
+        + "\n*Commands:*\n"
         "  /skills — list skills\n"
         "  /local — force on-device processing\n"
         "  /cloud — force cloud processing\n"
@@ -123,23 +145,35 @@ async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
         "  /privacy <text> — check text for PII\n"
         "\nJust send me a message to get started!"
     )
-    await update.message.reply_text(text, parse_mode="Markdown")
+    skills_text = f"*Available Skills ({len(skills)}):*\n\n" + "".join(
+        f"🔹 `{s.name}`\n   {s.description}\n\n" for s in skills
+    )
+    return start_text, skills_text
 
 
-async def cmd_skills(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    from agent.skills import get_registry
-    registry = get_registry()
-    skills = registry.list_skills()
+# Skills are fixed once the bot is running, so the registry is read once at
+# startup and the (start_text, skills_text) replies are rendered from that
+_command_texts = None
+
 
-    text = f"*Available Skills ({len(skills)}):*\n\n"
-    for s in skills:
-        text += f"🔹 `{s.name}`\n   {s.description}\n\n"
-    await update.message.reply_text(text, parse_mode="Markdown")
+def _get_command_texts() -> tuple:
+    global _command_texts
+    if _command_texts is None:
+        _command_texts = _build_command_texts(get_registry().list_skills())
+    return _command_texts
+
+
+async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await update.message.reply_text(_get_command_texts()[0], parse_mode="Markdown")
+
+
+async def cmd_skills(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    await update.message.reply_text(_get_command_texts()[1], parse_mode="Markdown")
 
 
 async def cmd_local(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
-    _user_overrides[user_id] = "local"
+    _set_override(user_id, "local")
     await update.message.reply_text(
         "📱 *Routing set to LOCAL*\nAll requests will be processed on-device.\n"
         "Use /auto to reset.",
@@ -149,7 +183,7 @@ async def cmd_local(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def cmd_cloud(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
-    _user_overrides[user_id] = "cloud"
+    _set_override(user_id, "cloud")
     await update.message.reply_text(
         "☁️ *Routing set to CLOUD*\nAll requests will use Gemini cloud.\n"
         "Use /auto to reset.",
@@ -197,32 +231,23 @@ async def cmd_privacy(update: Update, context: ContextTypes.DEFAULT_TYPE):
 async def handle_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_msg = update.message.text
     user_id = update.effective_user.id
-    override = _user_overrides.get(user_id, "auto")
+    override = _override_for(user_id)
 
     # Send typing action
     await update.message.chat.send_action("typing")
 
-    # Process in thread pool
-    loop = asyncio.get_event_loop()
+    # Same path as the gateway: scanning and skills run in worker threads and
+    # only inference queues on the single model worker
     try:
-        result = await loop.run_in_executor(
-            None,
-            process_chat,
-            user_msg,
-            override,
-            None,
-        )
+        result = await process_chat_async(user_msg, override, None)
         response = _format_response(result)
     except Exception as e:
         logger.error(f"Chat error: {e}", exc_info=True)
         response = f"❌ Error processing request: {e}"
 
     # Split long messages (Telegram limit: 4096 chars)
-    if len(response) > 4000:
-        for i in range(0, len(response), 4000):
-            await update.message.reply_text(response[i:i + 4000])
-    else:
-        await update.message.reply_text(response)
+    for chunk in _chunks(response):
+        await update.message.reply_text(chunk)
 
 
 # ---------------------------------------------------------------------------
@@ -240,6 +265,7 @@ def run_telegram_bot():
         sys.exit(1)
 
     _register_all_skills()
+    _get_command_texts()
 
     app = Application.builder().token(token).build()
 
@@ -1,7 +1,33 @@
 import os
 from flask import Flask, render_template
+from flask.json.provider import DefaultJSONProvider
 from .routes import bp
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify()/request.json via orjson, keeping Flask's sorted keys.
+
+    Datetimes are passed through to Flask's ``default`` so they still
+    serialise as HTTP dates. Unlike the stdlib encoder, NaN and infinity
+    become ``null`` rather than the invalid JSON tokens ``NaN``/``Infinity``,
+    and non-ASCII text is written as UTF-8 rather than ``\\u`` escapes.
+    """
+
+    _OPTIONS = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+    ) if orjson else 0
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default, option=self._OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 
 def create_web_app():
     """Create and configure the Flask web application."""
@@ -11,6 +37,8 @@ def create_web_app():
         static_folder=os.path.join(os.path.dirname(__file__), "static"),
     )
 
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
     app.register_blueprint(bp)
 
     @app.route("/")
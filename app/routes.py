@@ -1,7 +1,13 @@
-import json, subprocess
+import json, subprocess, time
+from functools import lru_cache
 from flask import Blueprint, request as flask_request, jsonify
 from main import generate_cactus, generate_cloud
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
 bp = Blueprint("api", __name__)
 
 TOOL_LIBRARY = {
@@ -88,26 +94,69 @@ TOOL_LIBRARY = {
 }
 
 
+_TOOL_NAMES = frozenset(TOOL_LIBRARY)
+
+
+def _select_tools(tool_names):
+    """Tool definitions for the requested names, deduped, in request order."""
+    return [TOOL_LIBRARY[t] for t in dict.fromkeys(tool_names) if t in _TOOL_NAMES]
+
+
+# Last `openclaw --version` result; re-checked at most once per TTL
+_OPENCLAW_CACHE = {"ts": 0.0, "value": None}
+_OPENCLAW_CACHE_TTL = 60.0
+
+
 def check_openclaw():
-    """Check if OpenClaw CLI is installed and reachable."""
+    """Check if OpenClaw CLI is installed and reachable (cached for 60s)."""
+    now = time.monotonic()
+    if _OPENCLAW_CACHE["value"] is not None and now - _OPENCLAW_CACHE["ts"] < _OPENCLAW_CACHE_TTL:
+        return _OPENCLAW_CACHE["value"]
+
+    value = {"available": False, "version": None}
     try:
         proc = subprocess.run(
             ["openclaw", "--version"],
             capture_output=True, text=True, timeout=5,
         )
         if proc.returncode == 0:
-            return {"available": True, "version": proc.stdout.strip()}
+            value = {"available": True, "version": proc.stdout.strip()}
     except (FileNotFoundError, subprocess.TimeoutExpired):
         pass
-    return {"available": False, "version": None}
+    _OPENCLAW_CACHE["ts"], _OPENCLAW_CACHE["value"] = now, value
+    return value
+
+
+@lru_cache(maxsize=64)
+def _library_tools_json(names):
+    return json.dumps([TOOL_LIBRARY[n] for n in names], separators=(",", ":"))
+
+
+def _tools_json(tools):
+    """Compact JSON for the prompt; cached when every tool is a TOOL_LIBRARY entry."""
+    names = tuple(t.get("name") for t in tools)
+    if all(TOOL_LIBRARY.get(n) is t for n, t in zip(names, tools)):
+        return _library_tools_json(names)
+    return json.dumps(tools, separators=(",", ":"))
+
+
+@lru_cache(maxsize=1)
+def _openclaw_reads_stdin():
+    """Whether `openclaw agent` advertises --stdin (checked once per process)."""
+    try:
+        proc = subprocess.run(
+            ["openclaw", "agent", "--help"],
+            capture_output=True, text=True, timeout=5,
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+    return "--stdin" in proc.stdout
 
 
 def generate_openclaw(messages, tools):
     """Run function calling via OpenClaw agent gateway."""
-    import time
-
     user_content = " ".join(m["content"] for m in messages if m["role"] == "user")
-    tool_desc = json.dumps(tools, indent=2)
+    tool_desc = _tools_json(tools)
     prompt = (
         f"Given these available tools:\n{tool_desc}\n\n"
         f"User request: {user_content}\n\n"
@@ -116,19 +165,25 @@ def generate_openclaw(messages, tools):
 
     start_time = time.time()
     try:
+        # Prefer the pipe: argv is length-limited and visible in the process table
+        if _openclaw_reads_stdin():
+            cmd, stdin = ["openclaw", "agent", "--stdin"], prompt
+        else:
+            cmd, stdin = ["openclaw", "agent", "--message", prompt], None
         proc = subprocess.run(
-            ["openclaw", "agent", "--message", prompt, "--json", "--timeout", "30"],
-            capture_output=True, text=True, timeout=35,
+            cmd + ["--json", "--timeout", "30"],
+            input=stdin, capture_output=True, text=True, timeout=35,
         )
         total_time_ms = (time.time() - start_time) * 1000
 
         if proc.returncode != 0:
             return {"function_calls": [], "total_time_ms": total_time_ms, "error": proc.stderr.strip()}
 
-        raw = json.loads(proc.stdout)
+        raw = _json_loads(proc.stdout)
         content = raw.get("content", raw.get("message", proc.stdout))
         try:
-            parsed = json.loads(content) if isinstance(content, str) else content
+            # Only string content needs a second parse
+            parsed = _json_loads(content) if isinstance(content, str) else content
             function_calls = parsed.get("function_calls", [])
         except (json.JSONDecodeError, AttributeError):
             function_calls = []
@@ -164,7 +219,7 @@ def api_analyze():
     data = flask_request.json
     messages = [{"role": "user", "content": data["message"]}]
     tool_names = data.get("tools", [])
-    tools = [TOOL_LIBRARY[t] for t in tool_names if t in TOOL_LIBRARY]
+    tools = _select_tools(tool_names)
     threshold = float(data.get("threshold", 0.99))
 
     if not tools:
@@ -188,7 +243,7 @@ def api_execute():
     data = flask_request.json
     messages = [{"role": "user", "content": data["message"]}]
     tool_names = data.get("tools", [])
-    tools = [TOOL_LIBRARY[t] for t in tool_names if t in TOOL_LIBRARY]
+    tools = _select_tools(tool_names)
     mode = data.get("mode", "local")
 
     if mode == "local":
@@ -1,12 +1,30 @@
 """Web UI entry point using the app/ package (interactive dot background)."""
 import sys
+import os
 import argparse
+import importlib.util
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="SecureClaw Web UI")
     parser.add_argument("--port", type=int, default=5001, help="Port (default: 5001)")
+    parser.add_argument("--dev", action="store_true", help="Use Flask's development server")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="gunicorn worker processes; each loads its own model (default: 1)")
+    parser.add_argument("--threads", type=int, default=8, help="Threads per gunicorn worker (default: 8)")
     args = parser.parse_args()
 
+    if not args.dev and importlib.util.find_spec("gunicorn") is not None:
+        print(f"\n  SecureClaw running at http://localhost:{args.port} (gunicorn)\n")
+        sys.stdout.flush()
+        os.execv(sys.executable, [
+            sys.executable, "-m", "gunicorn",
+            "-w", str(args.workers), "-k", "gthread", "--threads", str(args.threads),
+            "-b", f"0.0.0.0:{args.port}",
+            # app/ and main.py are imported relative to the repo root
+            "--chdir", os.path.dirname(os.path.abspath(__file__)),
+            "app:create_web_app()",
+        ])
+
     try:
         from app import create_web_app
     except ImportError:
@@ -14,5 +32,7 @@ if __name__ == "__main__":
         sys.exit(1)
 
     app = create_web_app()
+    if not args.dev:
+        print("  (gunicorn not found; using Flask's development server. pip install gunicorn)")
     print(f"\n  SecureClaw running at http://localhost:{args.port}\n")
     app.run(host="0.0.0.0", port=args.port, debug=False)
@@ -7,61 +7,193 @@ multi-tool queries directly to cloud.
 Phase 2 (post-inference): confidence gate after cactus_complete to catch
 uncertain local results and escalate to cloud.
 
-Zero ML/SDK dependencies — only stdlib.
+Zero ML/SDK dependencies — only stdlib. NumPy (seed search), hnswlib (large
+seed corpora) and pyahocorasick (keyword scan) are used when installed.
 """
 
 from __future__ import annotations
 
+import heapq
 import math
 import re
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Callable, List, Optional, Protocol, Sequence
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 # ---------------------------------------------------------------------------
 # Type aliases
 # ---------------------------------------------------------------------------
 EmbedFn = Callable[[str], List[float]]
+EmbedBatchFn = Callable[[List[str]], List[List[float]]]
 
 
 # ---------------------------------------------------------------------------
 # Vector store
 # ---------------------------------------------------------------------------
-def _cosine_similarity(a: List[float], b: List[float]) -> float:
-    dot = sum(x * y for x, y in zip(a, b))
-    na = math.sqrt(sum(x * x for x in a))
-    nb = math.sqrt(sum(x * x for x in b))
-    if na == 0 or nb == 0:
-        return 0.0
-    return dot / (na * nb)
+def _normalize(vec: List[float]) -> List[float]:
+    """Scale to unit length; a zero vector is returned as is.
 
+    With NumPy this returns a float32 array, which the matrix search then
+    uses without converting it again.
+    """
+    if np is not None:
+        v = np.asarray(vec, dtype=np.float32)
+        n = math.sqrt(float(np.vdot(v, v)))
+        return v / n if n else v
+    n = math.sqrt(sum(x * x for x in vec))
+    if n == 0:
+        return list(vec)
+    return [x / n for x in vec]
 
-@dataclass
+
+def _dot(a: List[float], b: List[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+@dataclass(slots=True)
 class SeedEntry:
     text: str
     tool_count: int
     privacy: float
     complexity: float
     tools: List[str]
+    # Unit-normalised (see _normalize) so cosine similarity is a dot product
     embedding: Optional[List[float]] = field(default=None, repr=False)
+    # tool_count >= 2, fixed at construction
+    is_multi_tool: bool = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.is_multi_tool = self.tool_count >= 2
+
+
+def _quantize_rows(m):
+    """Symmetric int8 quantisation: (int8 rows, per-row scale = 127 / peak)."""
+    peak = np.abs(m).max(axis=1)
+    peak[peak == 0] = 1.0
+    scales = (127.0 / peak).astype(np.float32)
+    return np.rint(m * scales[:, np.newaxis]).astype(np.int8), scales
 
 
 class InMemoryVectorStore:
-    """Brute-force cosine search over a small set of seed embeddings."""
+    """Brute-force cosine search over a small set of seed embeddings.
+
+    Entry embeddings and query vectors must be unit-normalised; similarity
+    is then just their dot product. Searches score a column of vectors kept
+    parallel to ``_indexed`` and only touch SeedEntry objects for the top-k
+    winners. With NumPy that column is one float32 matrix, so scoring is a
+    single matrix-vector product.
+
+    ``quantize=True`` stores that matrix as int8 with a scale per row, a
+    quarter of the memory for big corpora. Scores are then approximate
+    (to within about 0.01) and NumPy's integer matmul is slower than the
+    BLAS float path, so it is off by default. Needs NumPy.
+    """
 
-    def __init__(self) -> None:
+    def __init__(self, quantize: bool = False) -> None:
         self._entries: List[SeedEntry] = []
+        self._quantize = quantize and np is not None
+        # Embedded entries and their vectors (row i belongs to _indexed[i]),
+        # rebuilt on the first search after an add
+        self._indexed: List[SeedEntry] = []
+        self._matrix = None
+        self._scales = None
 
     def add(self, entry: SeedEntry) -> None:
         self._entries.append(entry)
+        self._matrix = None
+
+    def _build_matrix(self) -> None:
+        self._indexed = [e for e in self._entries if e.embedding is not None]
+        if np is None:
+            self._matrix = [e.embedding for e in self._indexed]
+            return
+        if not self._indexed:
+            self._matrix = np.zeros((0, 0), dtype=np.float32)
+            return
+        self._matrix = np.asarray([e.embedding for e in self._indexed], dtype=np.float32)
+        if self._quantize:
+            self._matrix, self._scales = _quantize_rows(self._matrix)
 
     def search(self, query_vec: List[float], top_k: int = 3) -> List[tuple[SeedEntry, float]]:
-        scored = [
-            (e, _cosine_similarity(query_vec, e.embedding))
-            for e in self._entries
-            if e.embedding is not None
-        ]
-        scored.sort(key=lambda x: x[1], reverse=True)
-        return scored[:top_k]
+        if self._matrix is None:
+            self._build_matrix()
+        if np is not None:
+            return self._search_matrix(query_vec, top_k)
+        scores = [_dot(query_vec, v) for v in self._matrix]
+        top = heapq.nlargest(top_k, range(len(scores)), key=scores.__getitem__)
+        return [(self._indexed[i], scores[i]) for i in top]
+
+    def _search_matrix(self, query_vec: List[float], top_k: int) -> List[tuple[SeedEntry, float]]:
+        n = len(self._indexed)
+        k = min(top_k, n)
+        if k <= 0:
+            return []
+
+        q = np.asarray(query_vec, dtype=np.float32)
+        if self._quantize:
+            qq, q_scale = _quantize_rows(q[np.newaxis, :])
+            dots = np.matmul(self._matrix, qq[0], dtype=np.int32)
+            scores = dots / (self._scales * q_scale[0])
+        else:
+            scores = self._matrix @ q
+        idx = np.argpartition(-scores, k - 1)[:k] if k < n else np.arange(n)
+        # Best first; ties keep insertion order like the sorted() path
+        idx = idx[np.lexsort((idx, -scores[idx]))]
+        return [(self._indexed[i], float(scores[i])) for i in idx]
+
+
+class HNSWVectorStore:
+    """Approximate nearest-neighbour search for large seed corpora (hnswlib).
+
+    Same add/search interface and unit-vector contract as
+    InMemoryVectorStore, so it uses hnswlib's inner-product space. Entries
+    without an embedding are not searchable and are skipped.
+    """
+
+    def __init__(self, m: int = 16, ef_construction: int = 200, ef: int = 50) -> None:
+        self._entries: List[SeedEntry] = []  # index label = position
+        self._index = None
+        self._m = m
+        self._ef_construction = ef_construction
+        self._ef = ef
+
+    def add(self, entry: SeedEntry) -> None:
+        if entry.embedding is None:
+            return
+        vec = np.asarray(entry.embedding, dtype=np.float32)
+        if self._index is None:
+            self._index = hnswlib.Index(space="ip", dim=vec.shape[0])
+            self._index.init_index(max_elements=1024, ef_construction=self._ef_construction, M=self._m)
+            self._index.set_ef(self._ef)
+        elif len(self._entries) == self._index.get_max_elements():
+            self._index.resize_index(2 * len(self._entries))
+        self._index.add_items(vec[np.newaxis, :], [len(self._entries)])
+        self._entries.append(entry)
+
+    def search(self, query_vec: List[float], top_k: int = 3) -> List[tuple[SeedEntry, float]]:
+        k = min(top_k, len(self._entries))
+        if k <= 0:
+            return []
+        if k > self._ef:
+            self._index.set_ef(k)  # hnswlib needs ef >= k
+        labels, distances = self._index.knn_query(np.asarray(query_vec, dtype=np.float32), k=k)
+        # Inner-product distance is 1 - dot
+        return [(self._entries[i], 1.0 - float(d)) for i, d in zip(labels[0], distances[0])]
 
 
 # ---------------------------------------------------------------------------
@@ -170,42 +302,155 @@ _PII_PATTERNS: List[tuple[re.Pattern, float]] = [
     (re.compile(r"\b\d{3}[-.]?\d{3}[-.]?\d{4}\b"), 0.3),     # phone number
 ]
 
+# All tiers in one pattern, highest weight first. Each branch sits in a
+# lookahead so a match never consumes text another tier could match (e.g.
+# "secret" inside an email address), and the branch that fires at a
+# position is the heaviest one matching there. Every tier starts with \b, so
+# that test is hoisted in front to skip mid-word positions in one step.
+_PII_TIERS = sorted(_PII_PATTERNS, key=lambda pw: -pw[1])
+_PII_WEIGHTS = [w for _, w in _PII_TIERS]
+_PII_COMBINED = re.compile(r"\b(?:" + "|".join(
+    f"(?=(?P<g{i}>{f'(?i:{p.pattern})' if p.flags & re.I else p.pattern}))"
+    for i, (p, _) in enumerate(_PII_TIERS)
+) + ")")
+_PII_MAX = _PII_WEIGHTS[0]
+# Every tier needs a digit, an "@" or one of the keywords, so queries
+# without any of them (most of them) skip the tier scan entirely
+_PII_TRIGGER = re.compile(r"[\d@]|password|secret|private", re.I)
+
 # ---------------------------------------------------------------------------
 # Multi-tool detection patterns
 # ---------------------------------------------------------------------------
-_CONJUNCTIONS = re.compile(r"\b(and|then|also|plus|after that|as well|additionally)\b", re.I)
-_ACTION_VERBS = re.compile(
-    r"\b(set|send|play|get|check|search|find|create|remind|text|message|call|"
-    r"start|timer|alarm|weather|look up|tell me|wake|put on)\b", re.I
+_CONJ_WORDS = ("and", "then", "also", "plus", "after that", "as well", "additionally")
+_VERB_WORDS = (
+    "set", "send", "play", "get", "check", "search", "find", "create", "remind", "text",
+    "message", "call", "start", "timer", "alarm", "weather", "look up", "tell me", "wake", "put on",
+)
+
+# Conjunctions and action verbs in one pass. The two word lists share no
+# words, so a single scan finds exactly what two separate findalls would.
+_MULTI_TOOL_TOKENS = re.compile(
+    rf"\b(?:(?P<conj>{'|'.join(_CONJ_WORDS)})|(?P<verb>{'|'.join(_VERB_WORDS)}))\b", re.I
 )
-_COMMA_COMMANDS = re.compile(r",\s*(?:and\s+)?(?:then\s+)?", re.I)
+
+
+# One bit per action verb, so distinct verbs are tallied in an int mask
+_VERB_BITS = {w: 1 << i for i, w in enumerate(_VERB_WORDS)}
+
+
+def _build_keyword_automaton():
+    ac = ahocorasick.Automaton()
+    for w in _CONJ_WORDS:
+        ac.add_word(w, (len(w), "conj", 0))
+    for w, bit in _VERB_BITS.items():
+        ac.add_word(w, (len(w), "verb", bit))
+    ac.make_automaton()
+    return ac
+
+
+# Same keywords as an Aho-Corasick automaton (pyahocorasick), a single
+# linear scan of the lowercased query; _MULTI_TOOL_TOKENS is the fallback
+_KEYWORD_AC = _build_keyword_automaton() if ahocorasick is not None else None
+
+
+def _is_word_char(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _multi_tool_tokens(query: str) -> tuple[int, int]:
+    """(conjunction count, distinct action verb count) in the query."""
+    conjunctions = 0
+    seen = 0
+    if _KEYWORD_AC is None:
+        for m in _MULTI_TOOL_TOKENS.finditer(query):
+            if m.lastgroup == "conj":
+                conjunctions += 1
+            else:
+                seen |= _VERB_BITS.get(m.group("verb").casefold(), 0)
+        return conjunctions, seen.bit_count()
+
+    q = query.lower()
+    n = len(q)
+    for end, (length, kind, bit) in _KEYWORD_AC.iter(q):
+        start = end - length + 1
+        # Whole words only, like \b in the regex
+        if (start and _is_word_char(q[start - 1])) or (end + 1 < n and _is_word_char(q[end + 1])):
+            continue
+        if kind == "conj":
+            conjunctions += 1
+        else:
+            seen |= bit
+    return conjunctions, seen.bit_count()
+
+
+# Numeric arguments, for the complexity score
+_NUMBER_RE = re.compile(r"\b\d+\b")
+
+# Post-inference: dates FunctionGemma tends to hallucinate into time args
+_ISO_DATE = re.compile(r"\d{4}-\d{1,2}-\d{1,2}")
 
 
 # ---------------------------------------------------------------------------
 # SmartRouter
 # ---------------------------------------------------------------------------
+_HNSW_MIN_SEEDS = 1000
+# post_inference_gate escalates a single call when pre-inference multi > this
+_GATE_MULTI_TOOL = 0.50
+
+
 class SmartRouter:
     def __init__(
         self,
         embed_fn: Optional[EmbedFn] = None,
         seeds: Optional[List[dict]] = None,
         config: Optional[RouterConfig] = None,
+        embed_batch_fn: Optional[EmbedBatchFn] = None,
     ) -> None:
+        """``embed_batch_fn``, if given, embeds all seeds in one call (and
+        queries too when there is no ``embed_fn``)."""
+        if embed_fn is None and embed_batch_fn is not None:
+            def embed_fn(text: str) -> List[float]:
+                return embed_batch_fn([text])[0]
         self.config = config or RouterConfig()
         self._embed_fn = embed_fn
-        self._store = InMemoryVectorStore()
+        if embed_fn is not None:
+            # Repeated queries (retries, benchmark replays) reuse their
+            # similarity result instead of embedding and searching again
+            self._cached_similarity = lru_cache(maxsize=1024)(self._match_seeds)
+        else:
+            # Nothing to embed, so route on the heuristics without the
+            # similarity plumbing
+            self.should_route_to_cloud = self._route_heuristic_only
 
         corpus = seeds if seeds is not None else SEED_CORPUS
-        for s in corpus:
-            entry = SeedEntry(
+        # Brute force is exact and faster until the corpus gets large
+        if embed_fn is not None and hnswlib is not None and len(corpus) >= _HNSW_MIN_SEEDS:
+            self._store = HNSWVectorStore()
+        else:
+            self._store = InMemoryVectorStore()
+        entries = [
+            SeedEntry(
                 text=s["text"],
                 tool_count=s["tool_count"],
                 privacy=s["privacy"],
                 complexity=s["complexity"],
                 tools=s["tools"],
             )
-            if embed_fn is not None:
-                entry.embedding = embed_fn(entry.text)
+            for s in corpus
+        ]
+        if embed_batch_fn is not None:
+            vectors = embed_batch_fn([e.text for e in entries]) if entries else []
+            if len(vectors) != len(entries):
+                raise ValueError(
+                    f"embed_batch_fn returned {len(vectors)} vectors for {len(entries)} seeds"
+                )
+        elif embed_fn is not None:
+            vectors = [embed_fn(e.text) for e in entries]
+        else:
+            vectors = [None] * len(entries)
+        for entry, vec in zip(entries, vectors):
+            if vec is not None:
+                entry.embedding = _normalize(vec)
             self._store.add(entry)
 
     # -----------------------------------------------------------------------
@@ -214,22 +459,22 @@ class SmartRouter:
     def _score_multi_tool(self, query: str, tools: List[dict]) -> float:
         score = 0.0
 
+        conjunctions, verbs = _multi_tool_tokens(query)
+
         # Conjunction count
-        conjunctions = len(_CONJUNCTIONS.findall(query))
         if conjunctions >= 2:
             score += 0.45
         elif conjunctions >= 1:
             score += 0.30
 
         # Distinct action verbs
-        verbs = set(v.lower() for v in _ACTION_VERBS.findall(query))
-        if len(verbs) >= 3:
+        if verbs >= 3:
             score += 0.35
-        elif len(verbs) >= 2:
+        elif verbs >= 2:
             score += 0.20
 
-        # Comma-separated commands
-        commas = len(_COMMA_COMMANDS.findall(query))
+        # Comma-separated commands; each comma starts one ", and then" run
+        commas = query.count(",")
         if commas >= 2:
             score += 0.20
         elif commas >= 1:
@@ -242,10 +487,15 @@ class SmartRouter:
         return min(score, 1.0)
 
     def _score_privacy(self, query: str) -> float:
+        if not _PII_TRIGGER.search(query):
+            return 0.0
         max_score = 0.0
-        for pattern, weight in _PII_PATTERNS:
-            if pattern.search(query):
-                max_score = max(max_score, weight)
+        for m in _PII_COMBINED.finditer(query):
+            weight = _PII_WEIGHTS[int(m.lastgroup[1:])]
+            if weight > max_score:
+                max_score = weight
+                if max_score == _PII_MAX:
+                    break
         return max_score
 
     def _score_complexity(self, query: str, tools: List[dict]) -> float:
@@ -270,7 +520,7 @@ class SmartRouter:
             score += 0.05
 
         # Numeric arguments
-        numbers = re.findall(r"\b\d+\b", query)
+        numbers = _NUMBER_RE.findall(query)
         if len(numbers) >= 3:
             score += 0.15
         elif len(numbers) >= 1:
@@ -282,25 +532,27 @@ class SmartRouter:
         """Return (similarity_boost, matched_seeds)."""
         if self._embed_fn is None:
             return 0.0, []
+        sim_score, matched = self._cached_similarity(query)
+        return sim_score, list(matched)
 
-        query_vec = self._embed_fn(query)
-        results = self._store.search(query_vec, top_k=3)
+    def _match_seeds(self, query: str) -> tuple[float, tuple[tuple[str, float], ...]]:
+        results = self._store.search(_normalize(self._embed_fn(query)), top_k=3)
 
         if not results:
-            return 0.0, []
+            return 0.0, ()
 
-        matched = [(e.text, sim) for e, sim in results]
+        matched = tuple((e.text, sim) for e, sim in results)
         best_entry, best_sim = results[0]
 
         # Direct similarity score
         sim_score = max(0.0, best_sim - 0.5) * 2.0  # normalize 0.5-1.0 → 0.0-1.0
 
         # If best match is multi-tool with high similarity, boost
-        if best_entry.tool_count >= 2 and best_sim >= 0.70:
+        if best_entry.is_multi_tool and best_sim >= 0.70:
             sim_score = max(sim_score, 0.8)
 
         # Average top-3 multi-tool tendency
-        multi_tool_matches = sum(1 for e, s in results if e.tool_count >= 2 and s >= 0.60)
+        multi_tool_matches = sum(1 for e, s in results if e.is_multi_tool and s >= 0.60)
         if multi_tool_matches >= 2:
             sim_score = max(sim_score, 0.6)
 
@@ -315,13 +567,59 @@ class SmartRouter:
         multi = self._score_multi_tool(query, tools)
         privacy = self._score_privacy(query)
         complexity = self._score_complexity(query, tools)
+
+        if self._embed_fn is not None:
+            # Similarity can only add w_similarity plus the 0.3 multi boost
+            # below, so skip the embedding call when it can't change the route.
+            # A local decision also feeds post_inference_gate, so it is only
+            # taken when no boost could lift multi past the gate's borderline.
+            heuristic = cfg.w_multi_tool * multi + cfg.w_privacy * privacy + cfg.w_complexity * complexity
+            max_multi = min(multi + 0.3, 1.0)
+            ceiling = heuristic + cfg.w_multi_tool * (max_multi - multi) + cfg.w_similarity
+            route = None
+            if heuristic >= cfg.cloud_threshold:
+                route, why = "cloud", "heuristics alone cleared threshold"
+            elif ceiling < cfg.cloud_threshold and max_multi <= _GATE_MULTI_TOOL:
+                route, why = "local", f"similarity cannot reach threshold (max={ceiling:.3f})"
+            if route is not None:
+                return RoutingDecision(
+                    route=route,
+                    reason=f"short-circuit: {why} (blended={heuristic:.3f}, multi={multi:.2f})",
+                    multi_tool_score=multi,
+                    privacy_score=privacy,
+                    complexity_score=complexity,
+                    similarity_score=0.0,
+                    blended_score=heuristic,
+                    matched_seeds=[],
+                )
+
         sim_score, matched = self._score_similarity(query)
 
         # Boost multi_tool_score if similarity says it's multi-tool
         if sim_score >= 0.6:
-            multi = max(multi, multi + sim_score * 0.3)
-            multi = min(multi, 1.0)
+            multi = min(multi + sim_score * 0.3, 1.0)
+
+        return self._decision(multi, privacy, complexity, sim_score, matched)
+
+    def _route_heuristic_only(self, query: str, tools: List[dict]) -> RoutingDecision:
+        """should_route_to_cloud for a router without embed_fn (bound in __init__)."""
+        return self._decision(
+            self._score_multi_tool(query, tools),
+            self._score_privacy(query),
+            self._score_complexity(query, tools),
+            0.0,
+            [],
+        )
 
+    def _decision(
+        self,
+        multi: float,
+        privacy: float,
+        complexity: float,
+        sim_score: float,
+        matched: List[tuple[str, float]],
+    ) -> RoutingDecision:
+        cfg = self.config
         blended = (
             cfg.w_multi_tool * multi
             + cfg.w_privacy * privacy
@@ -383,23 +681,26 @@ class SmartRouter:
             if call_name not in tool_names:
                 return PostInferenceResult(True, confidence, f"called '{call_name}' not in available tools")
 
-        # Check: negative numeric arguments (e.g. minutes: -20)
+        # Argument checks in one pass. A negative number wins outright;
+        # otherwise a hallucinated date is reported ahead of an empty arg.
+        date_arg = empty_arg = None
         for k, v in call_args.items():
-            if isinstance(v, (int, float)) and v < 0:
+            if isinstance(v, str):
+                # ISO/long date strings when simple time expected (FunctionGemma hallucinates dates)
+                if date_arg is None and _ISO_DATE.search(v):
+                    date_arg = (k, v)
+                elif empty_arg is None and not v.strip():
+                    empty_arg = k
+            elif isinstance(v, (int, float)) and v < 0:
+                # Negative numeric arguments (e.g. minutes: -20)
                 return PostInferenceResult(True, confidence, f"negative arg {k}={v}")
-
-        # Check: ISO/long date strings when simple time expected (FunctionGemma hallucinates dates)
-        for k, v in call_args.items():
-            if isinstance(v, str) and re.search(r"\d{4}-\d{1,2}-\d{1,2}", v):
-                return PostInferenceResult(True, confidence, f"hallucinated date in {k}='{v}'")
-
-        # Check: empty string arguments
-        for k, v in call_args.items():
-            if isinstance(v, str) and not v.strip():
-                return PostInferenceResult(True, confidence, f"empty arg {k}")
+        if date_arg is not None:
+            return PostInferenceResult(True, confidence, f"hallucinated date in {date_arg[0]}='{date_arg[1]}'")
+        if empty_arg is not None:
+            return PostInferenceResult(True, confidence, f"empty arg {empty_arg}")
 
         # If pre-inference thought this was multi-tool, but local returned single call — suspect
-        if pre_decision.multi_tool_score > 0.50:
+        if pre_decision.multi_tool_score > _GATE_MULTI_TOOL:
             return PostInferenceResult(True, confidence, f"pre-inference multi_tool={pre_decision.multi_tool_score:.2f} but got single call")
 
         return PostInferenceResult(False, confidence, f"trust local: validated single call to {call_name}")
@@ -0,0 +1,29 @@
+"""Regression checks for the privacy scanner's Unicode handling."""
+
+from agent.privacy import PIIType, RiskLevel, redact_pii, scan_privacy
+
+
+def test_nbsp_separated_card_is_high():
+    text = "card 4111\xa01111\xa01111\xa01111"
+    result = scan_privacy(text)
+    assert result.risk_level is RiskLevel.HIGH
+    assert PIIType.CREDIT_CARD in {m.pii_type for m in result.pii_found}
+    assert redact_pii(text, result) == "card [REDACTED:credit_card]"
+
+
+def test_nbsp_separated_ssn_is_high():
+    result = scan_privacy("ssn 123\xa045\xa06789")
+    assert result.risk_level is RiskLevel.HIGH
+    assert PIIType.SSN in {m.pii_type for m in result.pii_found}
+
+
+def test_nbsp_separated_street_is_medium():
+    result = scan_privacy("123\xa0Main Street")
+    assert result.risk_level is RiskLevel.MEDIUM
+    assert [m.matched_text for m in result.pii_found] == ["123\xa0Main Street"]
+
+
+def test_non_ascii_digit_dob_is_medium():
+    result = scan_privacy("born on ١٢/١٢/١٩٩٠")
+    assert result.risk_level is RiskLevel.MEDIUM
+    assert PIIType.DATE_OF_BIRTH in {m.pii_type for m in result.pii_found}